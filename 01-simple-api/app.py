@@ -1,18 +1,54 @@
 # app.py
-from fastapi import FastAPI
-from pydantic import BaseModel
+import os
+import base64
+import logging
+import threading
+import binascii
+from typing import Annotated, Optional
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from store import ItemStore
+from persistence import ItemLog
+
+# uvicorn's logger, so startup messages show with the server's own
+logger = logging.getLogger("uvicorn.error")
 
 # Create FastAPI instance
 app = FastAPI(title="Sample FastAPI with Uvicorn", version="1.0.0")
-items = []
+items = ItemStore()
+# Routes run in a thread pool; writes change the store and append to the log under this lock
+write_lock = threading.RLock()
+
+# Optional persistence: set ITEMS_DATA_DIR to keep items across restarts
+DATA_DIR = os.getenv("ITEMS_DATA_DIR")
+FSYNC = os.getenv("ITEMS_FSYNC", "batch")                       # always | batch | off
+SNAPSHOT_EVERY = int(os.getenv("ITEMS_SNAPSHOT_EVERY", "100000"))
+item_log = None
 
 # Define request model
 class Item(BaseModel):
     id: int
     name: str
-    price: float
+    price: float = Field(allow_inf_nan=False)
     in_stock: bool = True
 
+# Restore the items from the snapshot and write log
+@app.on_event("startup")
+def on_startup():
+    global item_log
+    if DATA_DIR:
+        item_log = ItemLog(DATA_DIR, fsync=FSYNC, snapshot_every=SNAPSHOT_EVERY, lock=write_lock)
+        loaded, replayed = item_log.load(items, Item)
+        logger.info(f"Restored {len(items)} items ({loaded} from snapshot, {replayed} log entries replayed)")
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    if item_log:
+        item_log.close()
+
+
 # Root endpoint
 @app.get("/")
 def read_root():
@@ -25,23 +61,68 @@ def say_hello(name: str):
     return {"message": f"Hello, {name}!"}
 
 
-# GET all items 
+# Opaque cursor tokens wrap the id of the last item on a page
+def encode_cursor(id: int):
+    return base64.urlsafe_b64encode(str(id).encode()).decode()
+
+
+def decode_cursor(token: str):
+    try:
+        return int(base64.urlsafe_b64decode(token.encode()).decode())
+    except (ValueError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor token")
+
+
+# Serialize items one per line as they are read from the store, sent in small chunks
+def stream_items(after: Optional[int], filters: dict, chunk_size: int = 500):
+    lines = []
+    for item in items.iter_items(after, **filters):
+        lines.append(item.model_dump_json())
+        if len(lines) >= chunk_size:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+# GET all items, optionally filtered by stock and price range.
+# Pass limit/after for cursor pagination or stream=true for an NDJSON stream.
 @app.get("/items")
-def get_items():
-    if len(items) > 0:
-        return {"message": "All Items retrieved successfully", "items": items}
+def get_items(
+    in_stock: Optional[bool] = None,
+    min_price: Annotated[Optional[float], Query(allow_inf_nan=False)] = None,
+    max_price: Annotated[Optional[float], Query(allow_inf_nan=False)] = None,
+    limit: Annotated[Optional[int], Query(ge=1, le=1000)] = None,
+    after: Optional[str] = None,
+    stream: bool = False,
+):
+    filters = {"in_stock": in_stock, "min_price": min_price, "max_price": max_price}
+    after_id = decode_cursor(after) if after else None
+
+    if stream:
+        return StreamingResponse(stream_items(after_id, filters), media_type="application/x-ndjson")
+
+    if limit is not None or after_id is not None:
+        page, next_id = items.page(limit or 100, after_id, **filters)
+        next_token = encode_cursor(next_id) if next_id is not None else None
+        message = "Items retrieved successfully" if page else "No items found"
+        return {"message": message, "items": page, "next": next_token}
+
+    result = items.query(**filters)
+    if len(result) > 0:
+        return {"message": "All Items retrieved successfully", "items": result}
     else:
         return {"message": "No items found", "items": []}
 
 
-# find the item from array using id
+# find the item from the store using id
 def find_index(id: int):
-    return [item for item in items if item.id == id][0]   
+    return items.get(id)
 
 
 # GET the item with specific id
 @app.get("/items/{id}")
-def get_items(id: int):
+def get_item(id: int):
     item = find_index(id)
     if item:
         return {"message": f"Item {id} retrieved successfully", "item": item}
@@ -52,17 +133,21 @@ def get_items(id: int):
 # POST request with body validation
 @app.post("/items/")
 def create_item(item: Item):
-    items.append(item)
+    with write_lock:
+        items.add(item)
+        if item_log:
+            item_log.append_put(item, items)
     return {"message": "Item created successfully", "item": item}
 
 
 # Update the item with specific id 
 @app.put("/items/{id}")
 def update_item(id: int, item: Item):
-    updateItem = find_index(id)
-    print(updateItem)
+    with write_lock:
+        updateItem = items.update(id, item.name, item.price, item.in_stock)
+        if updateItem and item_log:
+            item_log.append_put(updateItem, items)
     if updateItem:
-        updateItem.__dict__.update({'name': item.name, 'price': item.price, 'in_stock': item.in_stock})
         return {"message": f"Item {id} updated successfully", "item": updateItem}
     else:
         return {"message": f"No item found with id {id}", "item": {}}
@@ -71,9 +156,11 @@ def update_item(id: int, item: Item):
 # Update the item with specific id 
 @app.delete("/items/{id}")
 def delete_item(id: int):
-    item = find_index(id)
+    with write_lock:
+        item = items.remove(id)
+        if item and item_log:
+            item_log.append_delete(id, items)
     if item:
-        items.remove(item)
         return {"message": f"Item {id} successfully removed", "item": item}
     else:
          return {"message": f"No item found with id {id}", "item": {}}
\ No newline at end of file
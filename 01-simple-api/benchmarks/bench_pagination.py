@@ -0,0 +1,65 @@
+# bench_pagination.py
+# Compares the full-list GET /items response with cursor pages and the NDJSON stream:
+# time-to-first-byte, total time and peak Python memory while building the response.
+# Run with: python benchmarks/bench_pagination.py [item_count]
+import sys
+import json
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.encoders import jsonable_encoder
+import app as api
+
+ITEM_COUNT = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+PAGE_SIZE = 1000
+
+
+def load_items(count: int):
+    for i in range(count):
+        api.items.add(api.Item(id=i, name=f"item-{i}", price=float(i % 5000), in_stock=i % 3 != 0))
+
+
+# What FastAPI does for the full-list response: encode everything, then dump one body
+def full_response():
+    body = json.dumps(jsonable_encoder(api.get_items(limit=None, after=None))).encode()
+    yield body
+
+
+def page_response():
+    yield json.dumps(jsonable_encoder(api.get_items(limit=PAGE_SIZE, after=None))).encode()
+
+
+def stream_response():
+    for chunk in api.stream_items(None, {}):
+        yield chunk.encode()
+
+
+def measure(name: str, response):
+    tracemalloc.start()
+    start = time.perf_counter()
+    first_byte = None
+    total_bytes = 0
+    for chunk in response():
+        if first_byte is None:
+            first_byte = time.perf_counter() - start
+        total_bytes += len(chunk)
+    total = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:>10} {first_byte * 1000:>12.1f} {total * 1000:>12.1f} {peak / 1024 / 1024:>14.1f} {total_bytes / 1024 / 1024:>12.1f}")
+
+
+def main():
+    print(f"Loading {ITEM_COUNT} items ...")
+    load_items(ITEM_COUNT)
+    print(f"{'mode':>10} {'ttfb (ms)':>12} {'total (ms)':>12} {'peak mem (MB)':>14} {'body (MB)':>12}")
+    measure("full", full_response)
+    measure("page", page_response)
+    measure("stream", stream_response)
+
+
+if __name__ == "__main__":
+    main()
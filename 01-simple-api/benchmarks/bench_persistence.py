@@ -0,0 +1,73 @@
+# bench_persistence.py
+# Measures write throughput for each fsync policy and startup time from a snapshot
+# compared with replaying the whole write log.
+# Run with: python benchmarks/bench_persistence.py [item_count]
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import Item
+from store import ItemStore
+from persistence import ItemLog, FSYNC_POLICIES
+
+ITEM_COUNT = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+WRITES = {"always": 2_000, "batch": 100_000, "off": 100_000}
+
+
+def make_item(i: int):
+    return Item(id=i, name=f"item-{i}", price=float(i % 5000), in_stock=i % 3 != 0)
+
+
+def bench_writes():
+    print(f"{'fsync':>8} {'writes':>10} {'writes/sec':>12}")
+    for policy in FSYNC_POLICIES:
+        with tempfile.TemporaryDirectory() as data_dir:
+            log = ItemLog(data_dir, fsync=policy, snapshot_every=10**9)
+            log.load(ItemStore(), Item)
+            count = WRITES[policy]
+            start = time.perf_counter()
+            for i in range(count):
+                log.append_put(make_item(i))
+            log.close()
+            elapsed = time.perf_counter() - start
+            print(f"{policy:>8} {count:>10} {count / elapsed:>12.0f}")
+
+
+def bench_startup():
+    with tempfile.TemporaryDirectory() as data_dir:
+        log = ItemLog(data_dir, fsync="off", snapshot_every=10**9)
+        store = ItemStore()
+        log.load(store, Item)
+        for i in range(ITEM_COUNT):
+            item = make_item(i)
+            store.add(item)
+            log.append_put(item)
+        log.close()
+
+        # startup by replaying every logged write
+        start = time.perf_counter()
+        replay_log = ItemLog(data_dir, fsync="off")
+        replay_log.load(ItemStore(), Item)
+        replay_time = time.perf_counter() - start
+        replay_log.snapshot(store)
+        replay_log.close()
+
+        # startup from the compacted snapshot
+        start = time.perf_counter()
+        snapshot_log = ItemLog(data_dir, fsync="off")
+        restored = ItemStore()
+        snapshot_log.load(restored, Item)
+        snapshot_time = time.perf_counter() - start
+        snapshot_log.close()
+
+    print(f"\nStartup with {ITEM_COUNT} items")
+    print(f"{'log replay (s)':>16} {'snapshot (s)':>14}")
+    print(f"{replay_time:>16.2f} {snapshot_time:>14.2f}")
+
+
+if __name__ == "__main__":
+    bench_writes()
+    bench_startup()
@@ -0,0 +1,58 @@
+# bench_store.py
+# Measures GET/PUT/DELETE latency of the item store as the item count grows.
+# Run with: python benchmarks/bench_store.py
+import sys
+import random
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import Item
+from store import ItemStore
+
+SIZES = [1_000, 10_000, 100_000, 500_000]
+OPERATIONS = 1_000
+
+
+def build_store(size: int):
+    store = ItemStore()
+    for i in range(size):
+        store.add(Item(id=i, name=f"item-{i}", price=round(random.uniform(1, 1000), 2), in_stock=i % 3 != 0))
+    return store
+
+
+# Average time per call in microseconds
+def measure(func, ids):
+    start = time.perf_counter()
+    for id in ids:
+        func(id)
+    return (time.perf_counter() - start) / len(ids) * 1_000_000
+
+
+# The list scan used by the original find_index, for comparison
+def list_lookup(items: list, id: int):
+    return [item for item in items if item.id == id][0]
+
+
+def main():
+    print(f"{'items':>10} {'get (us)':>10} {'put (us)':>10} {'delete (us)':>12} {'list get (us)':>14} {'filter (ms)':>12}")
+    for size in SIZES:
+        store = build_store(size)
+        ids = random.sample(range(size), OPERATIONS)
+
+        get_us = measure(store.get, ids)
+        put_us = measure(lambda id: store.update(id, "updated", random.uniform(1, 1000), True), ids)
+        list_items = store.all()
+        list_us = measure(lambda id: list_lookup(list_items, id), ids[:20])
+
+        start = time.perf_counter()
+        store.query(in_stock=True, min_price=100, max_price=110)
+        filter_ms = (time.perf_counter() - start) * 1000
+
+        delete_us = measure(store.remove, ids)
+        print(f"{size:>10} {get_us:>10.2f} {put_us:>10.2f} {delete_us:>12.2f} {list_us:>14.2f} {filter_ms:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+# persistence.py
+import os
+import json
+import mmap
+import time
+import shutil
+import threading
+from pathlib import Path
+from pydantic import TypeAdapter
+
+FSYNC_POLICIES = ("always", "batch", "off")
+
+# Items per snapshot line; each line is a JSON array validated in one call on load
+SNAPSHOT_BATCH_SIZE = 10_000
+
+
+# Append-only write log with periodic snapshots for the item store.
+#
+# Every create/update is logged as {"op": "put", "item": {...}} and every delete as
+# {"op": "del", "id": ...}. Once `snapshot_every` writes have been logged the store is
+# written to snapshot.ndjson (batches of items per line) in a background thread and the
+# log that it covers is dropped.
+# Recovery loads the snapshot and replays the remaining logs; replaying is idempotent, so a
+# crash at any point leaves a state that recovers to the last logged write.
+#
+# fsync policies:
+#   always  fsync after every write
+#   batch   fsync every `batch_size` writes, and at the latest `batch_interval` seconds after
+#           a write (a background thread flushes writes that no later write would pick up)
+#   off     flush every write to the OS without fsync; survives a crash of the process but
+#           not of the machine
+#
+# Pass the lock that guards the store as `lock` so that a store change and its log entry are
+# made under one lock and the log order always matches the order of the changes.
+class ItemLog:
+    def __init__(self, data_dir: str, fsync: str = "batch", batch_size: int = 100,
+                 batch_interval: float = 1.0, snapshot_every: int = 100_000, lock=None):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync policy must be one of {FSYNC_POLICIES}, got {fsync!r}")
+        self.data_dir = Path(data_dir)
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.snapshot_file = self.data_dir / "snapshot.ndjson"
+        self.log_file = self.data_dir / "items.log"
+        self.old_log_file = self.data_dir / "items.log.old"
+        self.fsync = fsync
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.snapshot_every = snapshot_every
+
+        # reentrant, as the caller may already hold it around the store change
+        self._lock = lock or threading.RLock()
+        self._file = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._since_snapshot = 0
+        self._snapshot_thread = None
+        self._flush_thread = None
+        self._closed = threading.Event()
+
+    # Rebuild the store from the snapshot and logs, then open the log for appending
+    def load(self, store, item_type):
+        loaded = 0
+        if self.snapshot_file.exists() and self.snapshot_file.stat().st_size > 0:
+            batch_adapter = TypeAdapter(list[item_type])
+            with open(self.snapshot_file, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for line in iter(mm.readline, b""):
+                    for item in batch_adapter.validate_json(line):
+                        store.add(item)
+                        loaded += 1
+        replayed = 0
+        for log_file in (self.old_log_file, self.log_file):
+            if log_file.exists():
+                replayed += self._replay(log_file, store, item_type)
+        self._since_snapshot = replayed
+        self._file = open(self.log_file, "a", encoding="utf-8")
+        if self.fsync == "batch":
+            self._flush_thread = threading.Thread(target=self._flush_periodically, daemon=True)
+            self._flush_thread.start()
+        return loaded, replayed
+
+    def _replay(self, log_file: Path, store, item_type):
+        count = 0
+        good_bytes = 0
+        with open(log_file, "rb") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line) if line.endswith(b"\n") else None
+                except ValueError:
+                    entry = None
+                if entry is None:
+                    # a torn final line from a crash mid-write; nothing after it was acknowledged
+                    break
+                if entry["op"] == "put":
+                    store.add(item_type.model_validate(entry["item"]))
+                else:
+                    store.remove(entry["id"])
+                count += 1
+                good_bytes += len(line)
+        # cut the torn tail so new entries are not appended to a partial line
+        if good_bytes < log_file.stat().st_size:
+            os.truncate(log_file, good_bytes)
+        return count
+
+    def append_put(self, item, store=None):
+        self._append({"op": "put", "item": item.model_dump()}, store)
+
+    def append_delete(self, id: int, store=None):
+        self._append({"op": "del", "id": id}, store)
+
+    def _append(self, entry: dict, store):
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._sync()
+            self._since_snapshot += 1
+            start_snapshot = store is not None and self._since_snapshot >= self.snapshot_every
+        if start_snapshot:
+            self.snapshot_async(store)
+
+    # Apply the fsync policy after a write; called with the lock held
+    def _sync(self, force: bool = False):
+        if self.fsync == "off" and not force:
+            self._file.flush()
+            return
+        self._unsynced += 1
+        if force or self.fsync == "always" or self._unsynced >= self.batch_size \
+                or time.monotonic() - self._last_sync >= self.batch_interval:
+            self._fsync()
+
+    def _fsync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    # Batch policy: fsync writes that have waited batch_interval seconds without a later write
+    def _flush_periodically(self):
+        while not self._closed.wait(self.batch_interval):
+            with self._lock:
+                if self._file and self._unsynced \
+                        and time.monotonic() - self._last_sync >= self.batch_interval:
+                    self._fsync()
+
+    # Start a snapshot in the background unless one is already running
+    def snapshot_async(self, store):
+        if self._snapshot_thread and self._snapshot_thread.is_alive():
+            return
+        self._snapshot_thread = threading.Thread(target=self.snapshot, args=(store,), daemon=True)
+        self._snapshot_thread.start()
+
+    def snapshot(self, store):
+        # rotate the log first so writes made while the snapshot runs land in a fresh log
+        with self._lock:
+            self._sync(force=True)
+            self._file.close()
+            if self.old_log_file.exists():
+                # an earlier snapshot never finished, so keep its log as well
+                with open(self.log_file, "rb") as src, open(self.old_log_file, "ab") as dst:
+                    shutil.copyfileobj(src, dst)
+                self.log_file.unlink()
+            else:
+                os.replace(self.log_file, self.old_log_file)
+            self._file = open(self.log_file, "a", encoding="utf-8")
+            self._since_snapshot = 0
+            items = store.all()
+
+        tmp_file = self.snapshot_file.with_suffix(".tmp")
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            for start in range(0, len(items), SNAPSHOT_BATCH_SIZE):
+                batch = items[start:start + SNAPSHOT_BATCH_SIZE]
+                f.write("[" + ",".join(item.model_dump_json() for item in batch) + "]\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.snapshot_file)
+        self.old_log_file.unlink(missing_ok=True)
+
+    def close(self):
+        self._closed.set()
+        if self._flush_thread:
+            self._flush_thread.join()
+        if self._snapshot_thread:
+            self._snapshot_thread.join()
+        with self._lock:
+            if self._file:
+                self._sync(force=True)
+                self._file.close()
+                self._file = None
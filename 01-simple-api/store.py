@@ -0,0 +1,163 @@
+# store.py
+import math
+from bisect import bisect_left, bisect_right, insort
+from itertools import islice
+
+# Width of a price range bucket in the secondary price index
+PRICE_BUCKET_SIZE = 10.0
+
+# Ids are kept in sorted blocks of up to 2^ID_BLOCK_BITS consecutive ids for ordered paging
+ID_BLOCK_BITS = 10
+
+
+# In-memory item store with an id-keyed primary index, an id-ordered
+# block index for paging and secondary indexes on price ranges and in_stock
+class ItemStore:
+    def __init__(self, price_bucket_size: float = PRICE_BUCKET_SIZE):
+        self._items = {}                        # id -> item
+        self._id_blocks = {}                    # block key -> sorted list of ids
+        self._block_keys = []                   # sorted block keys
+        self._bucket_size = price_bucket_size
+        self._by_price = {}                     # price bucket -> set of ids
+        self._by_stock = {True: set(), False: set()}
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, id: int):
+        return id in self._items
+
+    def _add_id(self, id: int):
+        key = id >> ID_BLOCK_BITS
+        block = self._id_blocks.get(key)
+        if block is None:
+            block = self._id_blocks[key] = []
+            insort(self._block_keys, key)
+        insort(block, id)
+
+    def _remove_id(self, id: int):
+        key = id >> ID_BLOCK_BITS
+        block = self._id_blocks[key]
+        del block[bisect_left(block, id)]
+        if not block:
+            del self._id_blocks[key]
+            del self._block_keys[bisect_left(self._block_keys, key)]
+
+    # Yield ids in ascending order starting after the given id
+    def _iter_ids(self, after: int = None):
+        pos = 0 if after is None else bisect_left(self._block_keys, after >> ID_BLOCK_BITS)
+        while pos < len(self._block_keys):
+            key = self._block_keys[pos]
+            block = self._id_blocks.get(key, [])
+            start = 0 if after is None else bisect_right(block, after)
+            # copy the slice so writes between yields cannot break the iteration
+            for id in block[start:]:
+                after = id
+                yield id
+            pos = bisect_right(self._block_keys, key)
+
+    def _bucket(self, price: float):
+        if not math.isfinite(price):
+            raise ValueError(f"price must be a finite number, got {price}")
+        return math.floor(price / self._bucket_size)
+
+    # Add the item to the secondary indexes
+    def _index(self, item):
+        self._by_price.setdefault(self._bucket(item.price), set()).add(item.id)
+        self._by_stock[item.in_stock].add(item.id)
+
+    # Remove the item from the secondary indexes
+    def _unindex(self, item):
+        bucket = self._bucket(item.price)
+        ids = self._by_price[bucket]
+        ids.discard(item.id)
+        if not ids:
+            del self._by_price[bucket]
+        self._by_stock[item.in_stock].discard(item.id)
+
+    def get(self, id: int):
+        return self._items.get(id)
+
+    def add(self, item):
+        # bucket the price first so an unindexable price fails before anything is changed
+        self._bucket(item.price)
+        old = self._items.get(item.id)
+        if old is not None:
+            self._unindex(old)
+        else:
+            self._add_id(item.id)
+        self._items[item.id] = item
+        self._index(item)
+        return item
+
+    def update(self, id: int, name: str, price: float, in_stock: bool):
+        item = self._items.get(id)
+        if item is None:
+            return None
+        self._bucket(price)
+        self._unindex(item)
+        item.__dict__.update({'name': name, 'price': price, 'in_stock': in_stock})
+        self._index(item)
+        return item
+
+    def remove(self, id: int):
+        item = self._items.pop(id, None)
+        if item is not None:
+            self._unindex(item)
+            self._remove_id(id)
+        return item
+
+    def all(self):
+        return list(self._items.values())
+
+    # Ids whose price lies in [min_price, max_price]; only the edge buckets need a price check
+    def _ids_in_price_range(self, min_price: float = None, max_price: float = None):
+        low = -math.inf if min_price is None else self._bucket(min_price)
+        high = math.inf if max_price is None else self._bucket(max_price)
+        ids = set()
+        for bucket, bucket_ids in self._by_price.items():
+            if bucket < low or bucket > high:
+                continue
+            if bucket == low or bucket == high:
+                for id in bucket_ids:
+                    price = self._items[id].price
+                    if (min_price is None or price >= min_price) and (max_price is None or price <= max_price):
+                        ids.add(id)
+            else:
+                ids.update(bucket_ids)
+        return ids
+
+    # Filter items using the secondary indexes
+    def query(self, in_stock: bool = None, min_price: float = None, max_price: float = None):
+        ids = None
+        if min_price is not None or max_price is not None:
+            ids = self._ids_in_price_range(min_price, max_price)
+        if in_stock is not None:
+            stock_ids = self._by_stock[in_stock]
+            ids = set(stock_ids) if ids is None else ids & stock_ids
+        # id order, filtered or not
+        if ids is None:
+            return [self._items[id] for id in self._iter_ids()]
+        return [self._items[id] for id in sorted(ids)]
+
+    # Yield items in id order after the given id, so large results never need to be materialized.
+    # Filters are tested per item while seeking through the id index, so a page costs the ids
+    # it walks over rather than a sort of the whole filtered set.
+    def iter_items(self, after: int = None, in_stock: bool = None, min_price: float = None, max_price: float = None):
+        for id in self._iter_ids(after):
+            item = self._items.get(id)
+            if item is None:
+                continue
+            if in_stock is not None and item.in_stock != in_stock:
+                continue
+            if min_price is not None and item.price < min_price:
+                continue
+            if max_price is not None and item.price > max_price:
+                continue
+            yield item
+
+    # One page of items plus the id to continue after (None on the last page)
+    def page(self, limit: int, after: int = None, **filters):
+        result = list(islice(self.iter_items(after, **filters), limit + 1))
+        next_after = result[limit - 1].id if len(result) > limit else None
+        return result[:limit], next_after
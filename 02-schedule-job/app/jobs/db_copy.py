@@ -1,12 +1,87 @@
+import time
 import logging
+from numbers import Number
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from utils.db_type import DBType
 from utils.db import get_connection
+from utils.metrics import process_peak_rss_mb, format_mb
+from utils.checkpoint import load_checkpoint, save_checkpoint, clear_checkpoint, encode_value, decode_value
 
 logger = logging.getLogger(__name__)
 
-def copy_table_data(source_table='CUSTOMER', target_table='CUSTOMER'):
+# Create the target table from the source column definitions; returns True if it was created
+def ensure_target_table(src_cursor, tgt_cursor, source_table, target_table):
+    # --- Check if target table exists ---
+    tgt_cursor.execute("""
+        SELECT COUNT(*)
+        FROM user_tables
+        WHERE table_name = :tname
+    """, [target_table.upper()])
+    exists = tgt_cursor.fetchone()[0] > 0
+    logger.info(f"{target_table} was exists: {exists}.")
+
+    # --- Create table dynamically if not exists ---
+    if not exists:
+        # Get column types from source
+        src_cursor.execute(f"""
+            SELECT column_name, data_type, data_length
+            FROM user_tab_columns
+            WHERE table_name = :tname
+        """, [source_table.upper()])
+        cols = src_cursor.fetchall()
+
+        col_defs = []
+        for cname, dtype, length in cols:
+            if dtype in ("VARCHAR2", "CHAR"):
+                col_defs.append(f"{cname} {dtype}({length})")
+            else:
+                col_defs.append(f"{cname} {dtype}")
+        create_sql = f"CREATE TABLE {target_table} ({', '.join(col_defs)})"
+        tgt_cursor.execute(create_sql)
+        logger.info(f"Target table {target_table} created.")
+    return not exists
+
+def get_column_names(src_cursor, source_table):
+    src_cursor.execute(f"SELECT * FROM {source_table} WHERE ROWNUM = 1")
+    return [desc[0] for desc in src_cursor.description]
+
+# Write the rows of an executed source query in batches, committing every commit_every rows.
+# on_commit(last_row, copied) runs after each commit. Returns (rows read, rows applied).
+def copy_batches(src_cursor, target_conn, tgt_cursor, insert_sql, batch_size, commit_every, on_commit=None):
+    copied = 0
+    applied = 0
+    uncommitted = 0
+    last_row = None
+    while True:
+        rows = src_cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        tgt_cursor.executemany(insert_sql, rows)
+        applied += tgt_cursor.rowcount if tgt_cursor.rowcount >= 0 else len(rows)
+        copied += len(rows)
+        uncommitted += len(rows)
+        last_row = rows[-1]
+        if uncommitted >= commit_every:
+            target_conn.commit()
+            uncommitted = 0
+            if on_commit:
+                on_commit(last_row, copied)
+    if uncommitted:
+        target_conn.commit()
+        if on_commit:
+            on_commit(last_row, copied)
+    return copied, applied
+
+# Stream the source table into the target in batches ordered by key_column, committing every
+# commit_every rows. The last committed key is checkpointed so a failed run resumes from there.
+# Returns the number of rows this run committed.
+def copy_table_data(source_table='CUSTOMER', target_table='CUSTOMER', key_column='ID',
+                    batch_size=5000, commit_every=50000):
     source_conn = None
     target_conn = None
+    checkpoint_key = f"db_copy:{source_table}->{target_table}"
+    start = time.perf_counter()
+    copied = 0
     try:
         # --- Connect to both DBs ---
         source_conn = get_connection(DBType.SOURCE)
@@ -17,49 +92,42 @@ def copy_table_data(source_table='CUSTOMER', target_table='CUSTOMER'):
 
         # --- 1. Fetch column metadata from source table ---
         logger.info(f"Retrieving column metadata from the source {source_table} table.")
-        src_cursor.execute(f"SELECT * FROM {source_table} WHERE ROWNUM = 1")
-        col_names = [desc[0] for desc in src_cursor.description]
+        col_names = get_column_names(src_cursor, source_table)
+        key_index = [c.upper() for c in col_names].index(key_column.upper())
 
-        # --- 2. Check if target table exists ---
-        tgt_cursor.execute("""
-            SELECT COUNT(*)
-            FROM user_tables
-            WHERE table_name = :tname
-        """, [target_table.upper()])
-        exists = tgt_cursor.fetchone()[0] > 0
-        logger.info(f"{target_table} was exists: {exists}.")
-
-        # --- 3. Create table dynamically if not exists ---
-        if not exists:
-            # Get column types from source
-            src_cursor.execute(f"""
-                SELECT column_name, data_type, data_length
-                FROM user_tab_columns
-                WHERE table_name = :tname
-            """, [source_table.upper()])
-            cols = src_cursor.fetchall()
-
-            col_defs = []
-            for cname, dtype, length in cols:
-                if dtype in ("VARCHAR2", "CHAR"):
-                    col_defs.append(f"{cname} {dtype}({length})")
-                else:
-                    col_defs.append(f"{cname} {dtype}")
-            create_sql = f"CREATE TABLE {target_table} ({', '.join(col_defs)})"
-            tgt_cursor.execute(create_sql)
-            logger.info(f"Target table {target_table} created.")
-
-        # --- 4. Copy data from source to target ---
-        src_cursor.execute(f"SELECT * FROM {source_table}")
-        rows = src_cursor.fetchall()
-
-        if rows:
-            placeholders = ", ".join([":" + str(i+1) for i in range(len(col_names))])
-            insert_sql = f"INSERT INTO {target_table} ({', '.join(col_names)}) VALUES ({placeholders})"
-
-            tgt_cursor.executemany(insert_sql, rows)
-            target_conn.commit()
-            logger.info(f"Copied {len(rows)} rows from {source_table} to {target_table}.")
+        # --- 2. Create the target table if it does not exist ---
+        ensure_target_table(src_cursor, tgt_cursor, source_table, target_table)
+
+        # --- 3. Resume after the last committed key of a failed run ---
+        checkpoint = load_checkpoint(checkpoint_key)
+        if checkpoint:
+            last_key = decode_value(checkpoint["last_key"])
+            logger.info(f"Resuming copy of {source_table} after {key_column} {last_key} "
+                        f"({checkpoint['rows']} rows already copied).")
+            src_cursor.execute(f"SELECT * FROM {source_table} WHERE {key_column} > :last_key ORDER BY {key_column}",
+                               [last_key])
+        else:
+            src_cursor.execute(f"SELECT * FROM {source_table} ORDER BY {key_column}")
+        resumed_rows = checkpoint["rows"] if checkpoint else 0
+
+        # --- 4. Copy data from source to target in batches ---
+        src_cursor.arraysize = batch_size
+        src_cursor.prefetchrows = batch_size + 1
+        placeholders = ", ".join([":" + str(i+1) for i in range(len(col_names))])
+        insert_sql = f"INSERT INTO {target_table} ({', '.join(col_names)}) VALUES ({placeholders})"
+
+        # rows committed by this run, so a failure part way still reports what was written
+        def on_commit(last_row, rows):
+            nonlocal copied
+            copied = rows
+            save_checkpoint(checkpoint_key, {"last_key": encode_value(last_row[key_index]), "rows": resumed_rows + rows})
+            logger.info(f"Committed {resumed_rows + rows} rows of {source_table} to {target_table}.")
+
+        copy_batches(src_cursor, target_conn, tgt_cursor, insert_sql, batch_size, commit_every, on_commit)
+        clear_checkpoint(checkpoint_key)
+
+        if copied or resumed_rows:
+            logger.info(f"Copied {resumed_rows + copied} rows from {source_table} to {target_table}.")
         else:
             logger.info("No rows found in source table.")
 
@@ -72,3 +140,245 @@ def copy_table_data(source_table='CUSTOMER', target_table='CUSTOMER'):
             source_conn.close()
         if target_conn:
             target_conn.close()
+        elapsed = time.perf_counter() - start
+        rate = copied / elapsed if elapsed > 0 else 0
+        logger.info(f"Copy of {source_table}: {copied} rows committed in {elapsed:.1f}s ({rate:.0f} rows/sec), "
+                    f"process peak RSS {format_mb(process_peak_rss_mb())}.")
+    return copied
+
+# Split the key range [low, high] into at most `partitions` contiguous ranges (start, end).
+# Every range but the last is half-open, start <= key < end, and the last one ends at high
+# inclusive, so each key falls in exactly one range whatever its type; integer keys are split
+# on whole numbers, DECIMAL and FLOAT keys on fractional bounds.
+def split_key_range(low, high, partitions):
+    if not all(isinstance(v, Number) and not isinstance(v, bool) for v in (low, high)):
+        raise ValueError(f"Key range {low!r}..{high!r} cannot be split, the key column must be numeric.")
+    if isinstance(low, int) and isinstance(high, int):
+        partitions = max(1, min(partitions, high - low + 1))
+        bounds = [low + (high - low + 1) * i // partitions for i in range(partitions)]
+    else:
+        partitions = max(1, partitions) if high > low else 1
+        bounds = [low + (high - low) * i / partitions for i in range(partitions)]
+    return list(zip(bounds, bounds[1:] + [high]))
+
+# Copy the rows of one key range on a dedicated source/target connection pair. The last
+# committed key is checkpointed under checkpoint_key; a partition with a checkpoint resumes
+# after that key, and one marked done is not started again.
+def copy_partition(index, low, high, last, source_table, target_table, key_column, col_names,
+                   batch_size, commit_every, checkpoint_key):
+    source_conn = None
+    target_conn = None
+    start = time.perf_counter()
+    key_index = [c.upper() for c in col_names].index(key_column.upper())
+    checkpoint = load_checkpoint(checkpoint_key) or {"rows": 0}
+    upper = "<=" if last else "<"
+    try:
+        source_conn = get_connection(DBType.SOURCE)
+        target_conn = get_connection(DBType.TARGET)
+        src_cursor = source_conn.cursor()
+        tgt_cursor = target_conn.cursor()
+        src_cursor.arraysize = batch_size
+        src_cursor.prefetchrows = batch_size + 1
+        if "last_key" in checkpoint:
+            resume_after = decode_value(checkpoint["last_key"])
+            logger.info(f"Partition {index} resuming after {key_column} {resume_after} "
+                        f"({checkpoint['rows']} rows already copied).")
+            src_cursor.execute(
+                f"SELECT * FROM {source_table} WHERE {key_column} > :low AND {key_column} {upper} :high "
+                f"ORDER BY {key_column}", [resume_after, high])
+        else:
+            src_cursor.execute(
+                f"SELECT * FROM {source_table} WHERE {key_column} >= :low AND {key_column} {upper} :high "
+                f"ORDER BY {key_column}", [low, high])
+
+        placeholders = ", ".join([":" + str(i+1) for i in range(len(col_names))])
+        insert_sql = f"INSERT INTO {target_table} ({', '.join(col_names)}) VALUES ({placeholders})"
+
+        def on_commit(last_row, rows):
+            save_checkpoint(checkpoint_key, {"last_key": encode_value(last_row[key_index]),
+                                             "rows": checkpoint["rows"] + rows, "done": False})
+            logger.info(f"Partition {index} [{low}..{high}]: committed {checkpoint['rows'] + rows} rows.")
+
+        rows, _ = copy_batches(src_cursor, target_conn, tgt_cursor, insert_sql, batch_size, commit_every, on_commit)
+        save_checkpoint(checkpoint_key, {"rows": checkpoint["rows"] + rows, "done": True})
+        return rows, time.perf_counter() - start
+    except Exception:
+        if target_conn:
+            target_conn.rollback()
+        raise
+    finally:
+        if source_conn:
+            source_conn.close()
+        if target_conn:
+            target_conn.close()
+
+# Copy the source table by splitting its numeric key range into partitions that are copied
+# concurrently, each on its own source/target connection pair from a pool of `workers` threads.
+# The partition plan and the progress of each partition are checkpointed, so running the job
+# again after a failure keeps the same ranges, skips the partitions that finished and resumes
+# the others after their last committed key. The checkpoints are removed once all succeed.
+def parallel_copy_table_data(source_table='CUSTOMER', target_table='CUSTOMER', key_column='ID',
+                             partitions=8, workers=4, batch_size=5000, commit_every=50000):
+    source_conn = None
+    target_conn = None
+    plan_key = f"parallel_copy:{source_table}->{target_table}"
+    start = time.perf_counter()
+    copied = 0
+    failed = []
+    try:
+        source_conn = get_connection(DBType.SOURCE)
+        target_conn = get_connection(DBType.TARGET)
+        src_cursor = source_conn.cursor()
+        tgt_cursor = target_conn.cursor()
+
+        # --- 1. Column metadata, target table and key ranges (those of a failed run if any) ---
+        col_names = get_column_names(src_cursor, source_table)
+        ensure_target_table(src_cursor, tgt_cursor, source_table, target_table)
+        plan = load_checkpoint(plan_key)
+        if plan:
+            ranges = [(decode_value(low), decode_value(high)) for low, high in plan["ranges"]]
+            logger.info(f"Resuming parallel copy of {source_table} to {target_table} ({len(ranges)} partitions).")
+        else:
+            src_cursor.execute(f"SELECT MIN({key_column}), MAX({key_column}) FROM {source_table}")
+            low, high = src_cursor.fetchone()
+            if low is None:
+                logger.info("No rows found in source table.")
+                return 0
+            ranges = split_key_range(low, high, partitions)
+            save_checkpoint(plan_key, {"ranges": [[encode_value(low), encode_value(high)] for low, high in ranges]})
+        logger.info(f"Copying {source_table} to {target_table} in {len(ranges)} partitions on {workers} workers.")
+    except Exception as e:
+        logger.error(f"Error preparing parallel copy: {e}")
+        return 0
+    finally:
+        if source_conn:
+            source_conn.close()
+        if target_conn:
+            target_conn.close()
+
+    # --- 2. Copy the partitions that have not finished concurrently ---
+    pending = []
+    for index, (part_low, part_high) in enumerate(ranges):
+        state = load_checkpoint(f"{plan_key}:{index}")
+        if state and state["done"]:
+            logger.info(f"Partition {index} [{part_low}..{part_high}] already copied ({state['rows']} rows).")
+        else:
+            pending.append((index, part_low, part_high))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="db_copy") as pool:
+        futures = {
+            pool.submit(copy_partition, index, part_low, part_high, index == len(ranges) - 1, source_table,
+                        target_table, key_column, col_names, batch_size, commit_every,
+                        f"{plan_key}:{index}"): (index, part_low, part_high)
+            for index, part_low, part_high in pending
+        }
+        for future in as_completed(futures):
+            index, part_low, part_high = futures[future]
+            try:
+                rows, elapsed = future.result()
+                copied += rows
+                rate = rows / elapsed if elapsed > 0 else 0
+                logger.info(f"Partition {index} [{part_low}..{part_high}] done: {rows} rows in {elapsed:.1f}s "
+                            f"({rate:.0f} rows/sec).")
+            except Exception as e:
+                failed.append(index)
+                logger.error(f"Partition {index} [{part_low}..{part_high}] failed: {e}")
+
+    elapsed = time.perf_counter() - start
+    rate = copied / elapsed if elapsed > 0 else 0
+    if failed:
+        logger.error(f"Parallel copy of {source_table} finished with failed partitions {sorted(failed)}; "
+                     f"run it again to resume them.")
+    else:
+        for index in range(len(ranges)):
+            clear_checkpoint(f"{plan_key}:{index}")
+        clear_checkpoint(plan_key)
+    logger.info(f"Parallel copy of {source_table}: {copied} rows in {elapsed:.1f}s ({rate:.0f} rows/sec), "
+                f"process peak RSS {format_mb(process_peak_rss_mb())}.")
+    return copied
+
+# MERGE one bound row into the target on key_column: update it when any column differs, insert
+# it otherwise. DECODE compares NULLs as equal, so a row that is unchanged (NULLs included) is
+# left alone and not counted; a table with only the key column has nothing to update.
+def build_merge_sql(target_table, col_names, key_column):
+    key = key_column.upper()
+    source_cols = ", ".join([f":{i+1} AS {c}" for i, c in enumerate(col_names)])
+    value_cols = [c for c in col_names if c.upper() != key]
+    insert_cols = ", ".join(col_names)
+    insert_values = ", ".join([f"s.{c}" for c in col_names])
+    merge_sql = (f"MERGE INTO {target_table} t "
+                 f"USING (SELECT {source_cols} FROM dual) s "
+                 f"ON (t.{key} = s.{key}) ")
+    if value_cols:
+        update_cols = ", ".join([f"t.{c} = s.{c}" for c in value_cols])
+        changed = " OR ".join([f"DECODE(t.{c}, s.{c}, 0, 1) = 1" for c in value_cols])
+        merge_sql += f"WHEN MATCHED THEN UPDATE SET {update_cols} WHERE {changed} "
+    return merge_sql + f"WHEN NOT MATCHED THEN INSERT ({insert_cols}) VALUES ({insert_values})"
+
+# Copy only the rows whose watermark_column (a last-modified timestamp or an increasing id) is at or
+# above the high-water mark of the previous run, upserting them into the target with batched MERGE.
+# The high-water mark is stored per source/target pair and advanced after every commit.
+def incremental_copy_table_data(source_table='CUSTOMER', target_table='CUSTOMER', key_column='ID',
+                                watermark_column='ID', batch_size=5000, commit_every=50000):
+    source_conn = None
+    target_conn = None
+    watermark_key = f"watermark:{source_table}->{target_table}:{watermark_column}"
+    start = time.perf_counter()
+    scanned = 0
+    applied = 0
+    try:
+        source_conn = get_connection(DBType.SOURCE)
+        target_conn = get_connection(DBType.TARGET)
+        src_cursor = source_conn.cursor()
+        tgt_cursor = target_conn.cursor()
+
+        # --- 1. Column metadata and target table (with a unique key index for MERGE) ---
+        col_names = get_column_names(src_cursor, source_table)
+        watermark_index = [c.upper() for c in col_names].index(watermark_column.upper())
+        if ensure_target_table(src_cursor, tgt_cursor, source_table, target_table):
+            tgt_cursor.execute(f"CREATE UNIQUE INDEX {target_table}_{key_column}_UK ON {target_table} ({key_column})")
+            logger.info(f"Unique index on {target_table}.{key_column} created.")
+
+        src_cursor.execute(f"SELECT COUNT(*) FROM {source_table}")
+        total_rows = src_cursor.fetchone()[0]
+
+        # --- 2. Fetch rows changed since the high-water mark ---
+        # >= re-reads rows sharing the last mark, so rows split across a commit are never skipped;
+        # MERGE makes re-applying them harmless
+        high_water_mark = decode_value(load_checkpoint(watermark_key))
+        src_cursor.arraysize = batch_size
+        src_cursor.prefetchrows = batch_size + 1
+        if high_water_mark is None:
+            logger.info(f"No high-water mark for {source_table}, copying all rows.")
+            src_cursor.execute(f"SELECT * FROM {source_table} ORDER BY {watermark_column}")
+        else:
+            logger.info(f"Copying {source_table} rows with {watermark_column} >= {high_water_mark}.")
+            src_cursor.execute(
+                f"SELECT * FROM {source_table} WHERE {watermark_column} >= :hwm ORDER BY {watermark_column}",
+                [high_water_mark])
+
+        # --- 3. Upsert the delta into the target ---
+        merge_sql = build_merge_sql(target_table, col_names, key_column)
+
+        def on_commit(last_row, rows):
+            nonlocal scanned
+            scanned = rows
+            save_checkpoint(watermark_key, encode_value(last_row[watermark_index]))
+
+        scanned, applied = copy_batches(src_cursor, target_conn, tgt_cursor, merge_sql, batch_size, commit_every, on_commit)
+        logger.info(f"Incremental copy of {source_table}: {total_rows} rows in source, {scanned} scanned, "
+                    f"{applied} applied to {target_table}, {total_rows - scanned} skipped.")
+
+    except Exception as e:
+        logger.error(f"Error in incremental copy: {e}")
+        if target_conn:
+            target_conn.rollback()
+    finally:
+        if source_conn:
+            source_conn.close()
+        if target_conn:
+            target_conn.close()
+        elapsed = time.perf_counter() - start
+        rate = scanned / elapsed if elapsed > 0 else 0
+        logger.info(f"Incremental copy of {source_table}: {scanned} rows in {elapsed:.1f}s ({rate:.0f} rows/sec), "
+                    f"process peak RSS {format_mb(process_peak_rss_mb())}.")
+    return scanned, applied
@@ -1,10 +1,16 @@
+import time
 import logging
+import oracledb
 import pandas as pd
+from pandas.api.types import is_bool_dtype, is_float_dtype, is_integer_dtype
 from utils.db_type import DBType
 from utils.db import get_connection
+from utils.metrics import process_peak_rss_mb, format_mb
 
 logger = logging.getLogger(__name__)
 
+CSV_FILE = "app/files/data.csv"
+
 # Infer SQL column types
 def infer_sql_type(dtype):
     if "int" in str(dtype):
@@ -18,32 +24,108 @@ def infer_sql_type(dtype):
     else:
         return "VARCHAR2(200)"
 
-def upload_excel_to_db():
+# Bind type declared up front for each SQL column type, so the driver does not
+# have to inspect the values of every batch
+def infer_bind_type(sql_type):
+    if sql_type in ("NUMBER", "FLOAT"):
+        return oracledb.DB_TYPE_NUMBER
+    elif sql_type == "BOOLEAN":
+        return oracledb.DB_TYPE_BOOLEAN
+    elif sql_type == "TIMESTAMP":
+        return oracledb.DB_TYPE_TIMESTAMP
+    else:
+        return 200
+
+# The dtypes later chunks are cast to: those of the first chunk, which fixed the column types
+# of the table, with nullable integers and booleans so that a column with gaps further down the
+# file keeps its type instead of turning into floats or objects
+def pin_dtypes(dtypes):
+    pinned = {}
+    for col, dtype in dtypes.items():
+        if is_integer_dtype(dtype):
+            pinned[col] = "Int64"
+        elif is_bool_dtype(dtype):
+            pinned[col] = "boolean"
+        else:
+            pinned[col] = dtype
+    return pinned
+
+# CSV spellings of the values a BOOLEAN column takes
+BOOLEAN_VALUES = {True: True, False: False, "True": True, "False": False, "true": True, "false": False}
+
+# Cast a later chunk to the pinned dtypes column by column. A value that does not fit the
+# column type the first chunk fixed (text in a numeric or boolean column) is uploaded as null
+# with a warning, rather than failing the cast or the insert after earlier chunks were committed.
+# Integer columns take fractions as they are, NUMBER holds both.
+def cast_chunk(chunk, dtypes):
+    for col, dtype in dtypes.items():
+        try:
+            chunk[col] = chunk[col].astype(dtype)
+            continue
+        except (TypeError, ValueError):
+            pass
+        if dtype == "Int64" or is_float_dtype(dtype):
+            converted = pd.to_numeric(chunk[col], errors="coerce")
+        elif dtype == "boolean":
+            converted = chunk[col].map(BOOLEAN_VALUES).astype("boolean")
+        else:
+            continue
+        dropped = int(converted.isna().sum() - chunk[col].isna().sum())
+        if dropped:
+            logger.warning(f"Column {col}: {dropped} values are not {dtype}; uploading them as null.")
+        chunk[col] = converted
+    return chunk
+
+# Convert a chunk to bind-ready row tuples column by column, without a pandas Series per row
+def chunk_to_rows(chunk):
+    columns = []
+    for _, col in chunk.items():
+        if col.hasnans:
+            col = col.astype(object).where(col.notna(), None)
+        columns.append(col.tolist())
+    return list(zip(*columns))
+
+def upload_excel_to_db(file_path=CSV_FILE, table_name="employee", chunksize=50000):
     conn = get_connection(DBType.SOURCE)
     cursor = conn.cursor()
+    start = time.perf_counter()
+    total = 0
     try:
-        df = pd.read_csv("app/files/data.csv")  # fails if file missing
-
-        columns = []
-        col_defs = []
-        
-        for col, dtype in df.dtypes.items():
-            sql_type = infer_sql_type(dtype)
-            columns.append(col.upper())
-            col_defs.append(f'"{col.upper()}" {sql_type}')
-
-        create_sql = f"CREATE TABLE employee ({', '.join(col_defs)})"
-        cursor.execute(create_sql)
-        logger.info("Create the employee table successfully.")
-
-        rows = [row for _, row in df.iterrows()]
-        
-        if rows:
-            placeholders = ", ".join([":" + str(i+1) for i in range(len(columns))])
-            insert_sql = f'INSERT INTO employee ({", ".join([f"{c}" for c in columns])}) VALUES ({placeholders})'
+        insert_sql = None
+        bind_types = []
+        dtypes = None
+
+        for chunk in pd.read_csv(file_path, chunksize=chunksize):  # fails if file missing
+            # --- Create the table and declare bind types from the first chunk ---
+            if insert_sql is None:
+                columns = []
+                col_defs = []
+                for col, dtype in chunk.dtypes.items():
+                    sql_type = infer_sql_type(dtype)
+                    columns.append(col.upper())
+                    col_defs.append(f'"{col.upper()}" {sql_type}')
+                    bind_types.append(infer_bind_type(sql_type))
 
+                create_sql = f"CREATE TABLE {table_name} ({', '.join(col_defs)})"
+                cursor.execute(create_sql)
+                logger.info(f"Create the {table_name} table successfully.")
+
+                placeholders = ", ".join([":" + str(i+1) for i in range(len(columns))])
+                insert_sql = f'INSERT INTO {table_name} ({", ".join([f"{c}" for c in columns])}) VALUES ({placeholders})'
+                dtypes = pin_dtypes(chunk.dtypes)
+            else:
+                # each chunk infers its own dtypes; keep them matching the table and bind types
+                chunk = cast_chunk(chunk, dtypes)
+
+            # --- Insert and commit chunk by chunk ---
+            rows = chunk_to_rows(chunk)
+            cursor.setinputsizes(*bind_types)
             cursor.executemany(insert_sql, rows)
             conn.commit()
+            total += len(rows)
+            logger.info(f"Uploaded {total} rows into {table_name}.")
+
+        if total:
             logger.info("Excel data uploaded to database successfully.")
         else:
             logger.info("No rows found in csv file.")
@@ -53,3 +135,8 @@ def upload_excel_to_db():
     finally:
         cursor.close()
         conn.close()
+        elapsed = time.perf_counter() - start
+        rate = total / elapsed if elapsed > 0 else 0
+        logger.info(f"Upload of {file_path}: {total} rows in {elapsed:.1f}s ({rate:.0f} rows/sec), "
+                    f"process peak RSS {format_mb(process_peak_rss_mb())}.")
+    return total
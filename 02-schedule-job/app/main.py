@@ -1,7 +1,8 @@
-import time
 import logging
 import schedule
 from logger import setup_logging
+from scheduler import JobRunner
+from utils.db import all_pool_stats, log_pool_stats, close_pools
 from jobs.db_copy import copy_table_data
 from jobs.db_report_email import send_db_report
 from jobs.excel_upload import upload_excel_to_db
@@ -11,18 +12,24 @@ def main():
     logger = logging.getLogger("main")
     logger.info("Application started")
 
+    # Jobs run on a worker pool so a long copy does not delay the others;
+    # connection pool statistics are read in the worker and logged after every job
+    runner = JobRunner(max_workers=3, collect_stats=all_pool_stats, on_finish=lambda name, stats: log_pool_stats(stats))
+
     # Schedule jobs
-    schedule.every().day.at("01:00").do(copy_table_data)      # Copy table daily at 1 AM
-    schedule.every().day.at("15:58").do(upload_excel_to_db) # Upload Excel every Monday 7 AM
-    schedule.every().day.at("16:32").do(send_db_report)       # Send DB report daily at 8 AM
+    schedule.every().day.at("01:00").do(runner.submit, copy_table_data)      # Copy table daily at 1 AM
+    schedule.every().day.at("15:58").do(runner.submit, upload_excel_to_db) # Upload Excel every Monday 7 AM
+    schedule.every().day.at("16:32").do(runner.submit, send_db_report)       # Send DB report daily at 8 AM
+    schedule.every().hour.do(runner.log_stats)                               # Log per-job run statistics
 
-    #schedule.every().minute.do(upload_excel_to_db) # Upload Excel every minutes
-    #schedule.every().hour.do(upload_excel_to_db) # Upload Excel every hour
-    #schedule.every().monday.at("07:00").do(upload_excel_to_db) # Upload Excel every Monday 7 AM
+    #schedule.every().minute.do(runner.submit, upload_excel_to_db) # Upload Excel every minutes
+    #schedule.every().hour.do(runner.submit, upload_excel_to_db) # Upload Excel every hour
+    #schedule.every().monday.at("07:00").do(runner.submit, upload_excel_to_db) # Upload Excel every Monday 7 AM
 
-    while True:
-        schedule.run_pending()
-        time.sleep(60)
+    try:
+        runner.run_forever()
+    finally:
+        close_pools()
 
 
 if __name__ == "__main__":
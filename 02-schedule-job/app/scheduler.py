@@ -0,0 +1,126 @@
+import time
+import logging
+import threading
+import schedule
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from logger import process_pool_logging
+
+logger = logging.getLogger(__name__)
+
+# Runs in the worker thread/process; timing is taken there so queueing delay counts as start lag.
+# collect_stats also runs there, so state that lives in the worker (its connection pools) is read
+# where the job ran and sent back with the result
+def timed_call(func, args, kwargs, collect_stats=None):
+    started_at = time.time()
+    start = time.perf_counter()
+    try:
+        func(*args, **kwargs)
+        error = None
+    except Exception as e:
+        error = str(e)
+    duration = time.perf_counter() - start
+    try:
+        stats = collect_stats() if collect_stats else None
+    except Exception as e:
+        logger.warning(f"Could not collect stats after {func.__name__}: {e}")
+        stats = None
+    return started_at, duration, error, stats
+
+# Name of one scheduled job: the function with its arguments, so the same function scheduled
+# with different arguments (e.g. two tables to copy) is tracked and guarded as separate jobs
+def job_name(func, args, kwargs):
+    arguments = [repr(arg) for arg in args] + [f"{key}={value!r}" for key, value in kwargs.items()]
+    return f"{func.__name__}({', '.join(arguments)})" if arguments else func.__name__
+
+# Dispatches scheduled jobs to a thread or process pool so a long job does not delay the others.
+# A job (function plus arguments) that is still running when it becomes due again is skipped
+# instead of overlapping, and every run records its start lag (actual start - scheduled time), duration and outcome.
+# on_finish(name, stats) is called in this process after each run with what collect_stats returned
+# in the worker; with use_processes collect_stats must be picklable (a module-level function).
+class JobRunner:
+    def __init__(self, max_workers=4, use_processes=False, scheduler=None, on_finish=None, collect_stats=None):
+        self.scheduler = scheduler or schedule.default_scheduler
+        self.on_finish = on_finish
+        self.collect_stats = collect_stats
+        if use_processes:
+            # records logged in the worker processes are sent back to this process's handlers
+            initializer, initargs = process_pool_logging()
+            self.pool = ProcessPoolExecutor(max_workers=max_workers, initializer=initializer, initargs=initargs)
+        else:
+            self.pool = ThreadPoolExecutor(max_workers=max_workers)
+        self._lock = threading.Lock()
+        self._running = {}
+        self._stats = {}
+        self._due = None
+
+    # Use as the scheduled callable: schedule.every().day.at("01:00").do(runner.submit, copy_table_data)
+    def submit(self, func, *args, **kwargs):
+        name = job_name(func, args, kwargs)
+        due = self._due.timestamp() if self._due else time.time()
+        with self._lock:
+            stats = self._stats.setdefault(name, {
+                "runs": 0, "failures": 0, "skipped": 0, "last_outcome": None,
+                "last_start_lag": None, "max_start_lag": 0.0, "last_duration": None, "total_duration": 0.0,
+            })
+            running = self._running.get(name)
+            if running and not running.done():
+                stats["skipped"] += 1
+                logger.warning(f"Job {name} is still running, skipping this run.")
+                return
+            future = self.pool.submit(timed_call, func, args, kwargs, self.collect_stats)
+            self._running[name] = future
+        future.add_done_callback(lambda f: self._finished(name, due, f))
+
+    def _finished(self, name, due, future):
+        try:
+            started_at, duration, error, worker_stats = future.result()
+        except Exception as e:  # the worker process died or the job could not be pickled
+            started_at, duration, error, worker_stats = None, 0.0, str(e), None
+        lag = started_at - due if started_at is not None else None
+        with self._lock:
+            stats = self._stats[name]
+            stats["runs"] += 1
+            stats["last_outcome"] = "failed" if error else "ok"
+            stats["last_duration"] = duration
+            stats["total_duration"] += duration
+            if lag is not None:
+                stats["last_start_lag"] = lag
+                stats["max_start_lag"] = max(stats["max_start_lag"], lag)
+            if error:
+                stats["failures"] += 1
+        lag_text = f"{lag:.2f}s" if lag is not None else "n/a"
+        if error:
+            logger.error(f"Job {name} failed after {duration:.2f}s (start lag {lag_text}): {error}")
+        else:
+            logger.info(f"Job {name} finished in {duration:.2f}s (start lag {lag_text}).")
+        if self.on_finish:
+            self.on_finish(name, worker_stats)
+
+    def stats(self):
+        with self._lock:
+            return {name: dict(values) for name, values in self._stats.items()}
+
+    def log_stats(self):
+        for name, stats in self.stats().items():
+            average = stats["total_duration"] / stats["runs"] if stats["runs"] else 0.0
+            logger.info(f"Job {name}: {stats['runs']} runs, {stats['failures']} failed, {stats['skipped']} skipped, "
+                        f"avg {average:.2f}s, max start lag {stats['max_start_lag']:.2f}s, last {stats['last_outcome']}.")
+
+    # Same as schedule.run_pending(), but remembers each job's scheduled time for the lag figures
+    def run_pending(self):
+        for job in sorted(job for job in self.scheduler.get_jobs() if job.should_run):
+            self._due = job.next_run
+            try:
+                job.run()
+            finally:
+                self._due = None
+
+    # Sleep exactly until the next job is due (at most max_sleep seconds) instead of polling every minute
+    def run_forever(self, max_sleep=60):
+        try:
+            while True:
+                self.run_pending()
+                idle = self.scheduler.idle_seconds
+                time.sleep(max_sleep if idle is None else min(max(idle, 0), max_sleep))
+        finally:
+            self.pool.shutdown(wait=True)
@@ -0,0 +1,68 @@
+import json
+import logging
+import threading
+from decimal import Decimal
+from datetime import date, datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_FILE = "app/files/checkpoints.json"
+
+# jobs running partitions on several threads update the same file
+_lock = threading.Lock()
+
+def _read(path):
+    file = Path(path or CHECKPOINT_FILE)
+    if not file.exists():
+        return {}
+    with open(file) as f:
+        return json.load(f)
+
+def _write(path, data):
+    # write to a temp file and rename so a crash never leaves a half written checkpoint
+    file = Path(path or CHECKPOINT_FILE)
+    tmp = file.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=2, default=str)
+    tmp.replace(file)
+
+# Checkpoint values that JSON cannot hold (timestamps, dates, exact decimals) are stored with
+# their type so they come back as the same type and compare with the column they came from
+def encode_value(value):
+    if isinstance(value, datetime):
+        return {"type": "datetime", "value": value.isoformat()}
+    if isinstance(value, date):
+        return {"type": "date", "value": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"type": "decimal", "value": str(value)}
+    return {"type": "value", "value": value}
+
+def decode_value(stored):
+    # checkpoints written before the type was stored hold the bare value
+    if not isinstance(stored, dict) or "type" not in stored:
+        return stored
+    if stored["type"] == "datetime":
+        return datetime.fromisoformat(stored["value"])
+    if stored["type"] == "date":
+        return date.fromisoformat(stored["value"])
+    if stored["type"] == "decimal":
+        return Decimal(stored["value"])
+    return stored["value"]
+
+def load_checkpoint(key, path=None):
+    return _read(path).get(key)
+
+def save_checkpoint(key, value, path=None):
+    with _lock:
+        data = _read(path)
+        data[key] = value
+        _write(path, data)
+
+def clear_checkpoint(key, path=None):
+    with _lock:
+        data = _read(path)
+        if data.pop(key, None) is None:
+            return
+        _write(path, data)
+    logger.info(f"Checkpoint {key} cleared.")
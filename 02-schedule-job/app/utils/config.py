@@ -0,0 +1,7 @@
+import json
+
+CONFIG_FILE = "app/config.json"
+
+# Parsed once and shared by utils.db and utils.mail
+with open(CONFIG_FILE) as f:
+    config = json.load(f)
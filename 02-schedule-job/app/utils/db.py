@@ -1,22 +1,86 @@
-import json
+import time
 import logging
+import threading
 import oracledb
 from utils.db_type import DBType
+from utils.config import config
 from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
 
-with open("app/config.json") as f:
-    config = json.load(f)
+_pools = {}
+_pool_lock = threading.Lock()
+_acquire_stats = {type: {"acquires": 0, "wait_total": 0.0, "wait_max": 0.0} for type in DBType}
 
-def get_connection(type:DBType):
+def get_db_config(type:DBType):
     if type == DBType.SOURCE:
-        dbConfig = config["oracle"][0]
+        return config["oracle"][0]
     else:
-        dbConfig = config["oracle"][1]
+        return config["oracle"][1]
+
+# One connection pool per database, created on first use and shared by all jobs
+def get_pool(type:DBType):
+    with _pool_lock:
+        pool = _pools.get(type)
+        if pool is None:
+            dbConfig = get_db_config(type)
+            poolConfig = config.get("pool", {})
+            dsn = f"{dbConfig['host']}:{dbConfig['port']}/{dbConfig['service_name']}"
+            pool = oracledb.create_pool(
+                user=dbConfig['username'],
+                password=dbConfig['password'],
+                dsn=dsn,
+                min=poolConfig.get("min", 1),
+                max=poolConfig.get("max", 8),
+                increment=poolConfig.get("increment", 1),
+                stmtcachesize=poolConfig.get("stmtcachesize", 50),
+                timeout=poolConfig.get("idle_timeout", 300),          # close idle connections after N seconds
+                ping_interval=poolConfig.get("ping_interval", 60),    # health check connections idle longer than N seconds
+                getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+                wait_timeout=poolConfig.get("wait_timeout", 30000),   # give up acquiring after N milliseconds
+            )
+            _pools[type] = pool
+            logger.info(f"Connection pool for {type.value} database created ({dsn}).")
+        return pool
+
+# Borrow a connection from the pool; conn.close() gives it back
+def get_connection(type:DBType):
+    pool = get_pool(type)
+    start = time.perf_counter()
+    conn = pool.acquire()
+    wait = time.perf_counter() - start
+    with _pool_lock:
+        stats = _acquire_stats[type]
+        stats["acquires"] += 1
+        stats["wait_total"] += wait
+        stats["wait_max"] = max(stats["wait_max"], wait)
+    return conn
+
+def pool_stats(type:DBType):
+    pool = _pools.get(type)
+    with _pool_lock:
+        stats = dict(_acquire_stats[type])
+    stats["avg_wait"] = stats["wait_total"] / stats["acquires"] if stats["acquires"] else 0.0
+    if pool is not None:
+        stats.update({"open": pool.opened, "busy": pool.busy, "max": pool.max})
+    return stats
+
+# Statistics of every pool this process has opened; JobRunner collects them in the worker
+# that ran a job, since a process pool's workers each have their own pools
+def all_pool_stats():
+    return {type: pool_stats(type) for type in list(_pools)}
+
+def log_pool_stats(pools=None):
+    for type, stats in (all_pool_stats() if pools is None else pools).items():
+        logger.info(f"Pool {type.value}: open={stats['open']} busy={stats['busy']} max={stats['max']} "
+                    f"acquires={stats['acquires']} avg wait={stats['avg_wait'] * 1000:.1f}ms "
+                    f"max wait={stats['wait_max'] * 1000:.1f}ms")
 
-    dsn = f"{dbConfig['host']}:{dbConfig['port']}/{dbConfig['service_name']}"
-    return oracledb.connect(user=dbConfig['username'], password=dbConfig['password'], dsn=dsn)
+def close_pools():
+    with _pool_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
 
 @contextmanager
 def get_cursor(type = DBType.SOURCE):
@@ -32,4 +96,4 @@ def get_cursor(type = DBType.SOURCE):
         raise e
     finally:
         cursor.close()
-        conn.close()
\ No newline at end of file
+        conn.close()
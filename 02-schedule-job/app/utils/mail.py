@@ -1,13 +1,10 @@
-import json
 import smtplib
 import logging
+from utils.config import config
 from email.mime.text import MIMEText
 
 logger = logging.getLogger(__name__)
 
-with open("app/config.json") as f:
-    config = json.load(f)
-
 def send_mail(subject, body):
     try:
         logger.info(config)
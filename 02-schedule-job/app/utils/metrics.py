@@ -0,0 +1,19 @@
+import sys
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+# Peak resident set size in MB of the whole process since it started (not of one job run),
+# or None where it cannot be read. A job sharing the scheduler process with other jobs reports
+# the highest footprint any of them reached; run a job in its own process to measure it alone.
+def process_peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def format_mb(value):
+    return "n/a" if value is None else f"{value:.1f} MB"
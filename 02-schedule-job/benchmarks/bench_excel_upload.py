@@ -0,0 +1,84 @@
+import os
+import sys
+import json
+import time
+import logging
+import tempfile
+import subprocess
+from pathlib import Path
+
+# Compares the chunked upload_excel_to_db with the original read-everything/iterrows loader.
+# Each run happens in its own process so peak RSS is measured per implementation.
+# Run from the project folder: python benchmarks/bench_excel_upload.py [rows ...]
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR / "app"))
+sys.path.insert(0, str(PROJECT_DIR / "benchmarks"))
+os.chdir(PROJECT_DIR)
+
+from synthetic import generate_csv
+
+DEFAULT_SIZES = [1_000_000, 10_000_000]
+
+
+# The loader as it was before chunking, kept here for comparison
+def legacy_upload(conn, file_path):
+    import pandas as pd
+    from jobs.excel_upload import infer_sql_type
+    cursor = conn.cursor()
+    df = pd.read_csv(file_path)
+    columns = []
+    col_defs = []
+    for col, dtype in df.dtypes.items():
+        columns.append(col.upper())
+        col_defs.append(f'"{col.upper()}" {infer_sql_type(dtype)}')
+    cursor.execute(f"CREATE TABLE employee ({', '.join(col_defs)})")
+    # the original collected the row Series, which Oracle accepted directly; the stand-in needs
+    # plain sequences, so each row is turned into a tuple as it is collected
+    rows = [tuple(row) for _, row in df.iterrows()]
+    placeholders = ", ".join([":" + str(i+1) for i in range(len(columns))])
+    insert_sql = f'INSERT INTO employee ({", ".join(columns)}) VALUES ({placeholders})'
+    cursor.executemany(insert_sql, rows)
+    conn.commit()
+    return len(rows)
+
+
+# Runs one implementation in this process and prints its measurements as JSON
+def run_one(impl, csv_path, db_path):
+    import standin_db
+    import utils.db
+    import jobs.excel_upload as excel_upload
+    from utils.db_type import DBType
+    from utils.metrics import process_peak_rss_mb
+
+    logging.basicConfig(level=logging.WARNING)
+    database = standin_db.StandInDatabase(db_path)
+    standin_db.install({DBType.SOURCE: database, DBType.TARGET: database}, [utils.db, excel_upload])
+    start = time.perf_counter()
+    if impl == "legacy":
+        rows = legacy_upload(database.connect(), csv_path)
+    else:
+        rows = excel_upload.upload_excel_to_db(file_path=csv_path)
+    elapsed = time.perf_counter() - start
+    print(json.dumps({"rows": rows, "seconds": elapsed, "peak_rss_mb": process_peak_rss_mb()}))
+
+
+def main(sizes):
+    print(f"{'rows':>10} {'loader':>8} {'seconds':>9} {'rows/sec':>10} {'peak RSS (MB)':>14}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as data_dir:
+            csv_path = str(Path(data_dir) / "data.csv")
+            generate_csv(csv_path, size)
+            for impl in ("legacy", "chunked"):
+                db_path = str(Path(data_dir) / f"{impl}.db")
+                output = subprocess.run([sys.executable, __file__, "--run", impl, csv_path, db_path],
+                                        capture_output=True, text=True, check=True).stdout
+                result = json.loads(output.strip().splitlines()[-1])
+                rate = result["rows"] / result["seconds"]
+                print(f"{size:>10} {impl:>8} {result['seconds']:>9.1f} {rate:>10.0f} {result['peak_rss_mb'] or 0:>14.1f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--run":
+        run_one(*sys.argv[2:5])
+    else:
+        main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,156 @@
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+# Benchmarks the scheduled jobs against the local SQLite stand-in instead of Oracle.
+# Synthetic CUSTOMER tables and CSV files are generated for every size, and each job runs in its
+# own process so wall time, rows/sec and peak RSS are measured per job.
+#
+# Run from the project folder:
+#   python benchmarks/bench_jobs.py --sizes 10000 100000 1000000 --save results.json
+#   python benchmarks/bench_jobs.py --sizes 100000 --baseline results.json   # exits 1 on regression
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR / "app"))
+sys.path.insert(0, str(PROJECT_DIR / "benchmarks"))
+os.chdir(PROJECT_DIR)
+
+from synthetic import create_customer_table, generate_csv
+
+JOBS = ["copy_table_data", "parallel_copy_table_data", "incremental_copy_table_data",
+        "incremental_copy_table_data (no changes)", "upload_excel_to_db", "send_db_report"]
+BATCH_SIZE = 5000
+
+
+def count_rows(database, table):
+    conn = database.connect()
+    try:
+        return conn._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    except Exception:  # the job never created the table
+        return 0
+    finally:
+        conn.close()
+
+
+# Runs one job in this process against the prepared data and prints its measurements as JSON.
+# The jobs log their errors instead of raising, so after each run the rows that actually landed
+# (or were mailed) are counted and a run that did not write them all exits with an error.
+def run_job(job, size, data_dir, latency):
+    import standin_db
+    import utils.db
+    import utils.checkpoint
+    import jobs.db_copy as db_copy
+    import jobs.excel_upload as excel_upload
+    import jobs.db_report_email as db_report_email
+    from utils.db_type import DBType
+    from utils.metrics import process_peak_rss_mb
+
+    logging.basicConfig(level=logging.WARNING)
+    data_dir = Path(data_dir)
+    # the two incremental runs share a target and checkpoint file so the second sees the first's mark
+    target_name = "incremental" if job.startswith("incremental") else job
+    source = standin_db.StandInDatabase(data_dir / "source.db", latency=latency)
+    target = standin_db.StandInDatabase(data_dir / f"target_{target_name}.db", latency=latency)
+    utils.checkpoint.CHECKPOINT_FILE = str(data_dir / f"checkpoints_{target_name}.json")
+    standin_db.install({DBType.SOURCE: source, DBType.TARGET: target},
+                       [utils.db, db_copy, excel_upload, db_report_email])
+    sent = []
+    db_report_email.send_mail = lambda subject, body: sent.append(body)
+    databases = [source, target]
+
+    start = time.perf_counter()
+    if job == "copy_table_data":
+        rows = db_copy.copy_table_data(batch_size=BATCH_SIZE, commit_every=BATCH_SIZE * 10)
+    elif job == "parallel_copy_table_data":
+        rows = db_copy.parallel_copy_table_data(partitions=8, workers=4, batch_size=BATCH_SIZE,
+                                                commit_every=BATCH_SIZE * 10)
+    elif job.startswith("incremental_copy_table_data"):
+        rows, _ = db_copy.incremental_copy_table_data(batch_size=BATCH_SIZE, commit_every=BATCH_SIZE * 10)
+    elif job == "upload_excel_to_db":
+        # the upload creates its table in the SOURCE database, so give it a private copy
+        upload_db = standin_db.StandInDatabase(data_dir / "upload.db", latency=latency)
+        standin_db.install({DBType.SOURCE: upload_db, DBType.TARGET: upload_db}, [utils.db, excel_upload])
+        databases = [upload_db]
+        rows = excel_upload.upload_excel_to_db(file_path=str(data_dir / "data.csv"), chunksize=BATCH_SIZE * 10)
+    else:
+        db_report_email.send_db_report()
+        # one report line per customer, each with its synthetic e-mail address
+        rows = sum(body.count("@example.com") for body in sent)
+    elapsed = time.perf_counter() - start
+
+    if job == "upload_excel_to_db":
+        landed, expected = count_rows(upload_db, "employee"), size
+    elif job == "send_db_report":
+        landed, expected = rows, min(size, 10)
+    else:
+        landed, expected = count_rows(target, "CUSTOMER"), size
+    if landed != expected:
+        sys.exit(f"{job} failed: {landed} rows written, {expected} expected (see the job's log output)")
+    print(json.dumps({"rows": rows or 0, "seconds": elapsed, "peak_rss_mb": process_peak_rss_mb(),
+                      "round_trips": sum(db.round_trips for db in databases)}))
+
+
+def prepare(data_dir, size):
+    import standin_db
+    create_customer_table(standin_db.StandInDatabase(Path(data_dir) / "source.db"), size)
+    generate_csv(Path(data_dir) / "data.csv", size)
+
+
+def compare(results, baseline_file, tolerance):
+    with open(baseline_file) as f:
+        baseline = {(r["job"], r["size"]): r for r in json.load(f)}
+    regressions = []
+    for result in results:
+        base = baseline.get((result["job"], result["size"]))
+        if base and base["rows_per_sec"] and result["rows_per_sec"] < base["rows_per_sec"] * (1 - tolerance):
+            regressions.append(result)
+            print(f"REGRESSION {result['job']} @ {result['size']}: "
+                  f"{result['rows_per_sec']:.0f} rows/sec vs baseline {base['rows_per_sec']:.0f}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scheduled jobs against a local stand-in database")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--jobs", nargs="+", default=JOBS, choices=JOBS)
+    parser.add_argument("--latency", type=float, default=0.0, help="milliseconds added to every round trip")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare rows/sec with a saved results file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed rows/sec drop against the baseline")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'job':>42} {'rows':>10} {'seconds':>9} {'rows/sec':>10} {'round trips':>12} {'peak RSS (MB)':>14}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as data_dir:
+            prepare(data_dir, size)
+            for job in args.jobs:
+                process = subprocess.run(
+                    [sys.executable, __file__, "--run", job, str(size), data_dir, str(args.latency / 1000)],
+                    capture_output=True, text=True)
+                if process.returncode:
+                    sys.exit(process.stderr)
+                result = json.loads(process.stdout.strip().splitlines()[-1])
+                result.update({"job": job, "size": size,
+                               "rows_per_sec": result["rows"] / result["seconds"] if result["seconds"] else 0})
+                results.append(result)
+                print(f"{job:>42} {result['rows']:>10} {result['seconds']:>9.2f} {result['rows_per_sec']:>10.0f} "
+                      f"{result['round_trips']:>12} {result['peak_rss_mb'] or 0:>14.1f}")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline and compare(results, args.baseline, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--run":
+        run_job(sys.argv[2], int(sys.argv[3]), sys.argv[4], float(sys.argv[5]))
+    else:
+        main()
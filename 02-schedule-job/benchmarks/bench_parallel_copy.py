@@ -0,0 +1,65 @@
+import os
+import sys
+import time
+import logging
+import tempfile
+from pathlib import Path
+
+# Run from the project folder: python benchmarks/bench_parallel_copy.py [rows] [latency_ms]
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR / "app"))
+sys.path.insert(0, str(PROJECT_DIR / "benchmarks"))
+os.chdir(PROJECT_DIR)
+
+import standin_db
+from synthetic import create_customer_table
+import utils.db
+import utils.checkpoint
+import jobs.db_copy as db_copy
+from utils.db_type import DBType
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+LATENCY = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.005
+BATCH_SIZE = 2000
+WORKERS = [1, 2, 4, 8]
+
+
+def check_target(database, rows):
+    conn = database.connect()
+    count, distinct, low, high = conn._conn.execute(
+        "SELECT COUNT(*), COUNT(DISTINCT ID), MIN(ID), MAX(ID) FROM CUSTOMER").fetchone()
+    conn._conn.execute("DROP TABLE CUSTOMER")
+    conn.commit()
+    conn.close()
+    ok = count == distinct == rows and low == 1 and high == rows
+    return "ok" if ok else f"MISMATCH count={count} distinct={distinct}"
+
+
+def main():
+    logging.basicConfig(level=logging.WARNING)
+    with tempfile.TemporaryDirectory() as data_dir:
+        source = standin_db.StandInDatabase(Path(data_dir) / "source.db", latency=LATENCY)
+        target = standin_db.StandInDatabase(Path(data_dir) / "target.db", latency=LATENCY)
+        utils.checkpoint.CHECKPOINT_FILE = str(Path(data_dir) / "checkpoints.json")
+        standin_db.install({DBType.SOURCE: source, DBType.TARGET: target}, [utils.db, db_copy])
+        create_customer_table(source, ROWS)
+
+        print(f"Copying {ROWS} rows, {LATENCY * 1000:.1f} ms per round trip, batch size {BATCH_SIZE}")
+        print(f"{'mode':>12} {'workers':>8} {'seconds':>9} {'rows/sec':>10} {'speedup':>8} {'check':>8}")
+
+        start = time.perf_counter()
+        db_copy.copy_table_data(batch_size=BATCH_SIZE, commit_every=BATCH_SIZE)
+        baseline = time.perf_counter() - start
+        print(f"{'sequential':>12} {1:>8} {baseline:>9.2f} {ROWS / baseline:>10.0f} {1:>8.2f} {check_target(target, ROWS):>8}")
+
+        for workers in WORKERS:
+            start = time.perf_counter()
+            db_copy.parallel_copy_table_data(partitions=workers * 2, workers=workers,
+                                             batch_size=BATCH_SIZE, commit_every=BATCH_SIZE)
+            elapsed = time.perf_counter() - start
+            print(f"{'parallel':>12} {workers:>8} {elapsed:>9.2f} {ROWS / elapsed:>10.0f} "
+                  f"{baseline / elapsed:>8.2f} {check_target(target, ROWS):>8}")
+
+
+if __name__ == "__main__":
+    main()
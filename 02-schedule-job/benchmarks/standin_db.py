@@ -0,0 +1,169 @@
+import re
+import time
+import sqlite3
+import threading
+
+# A local, SQLite-backed stand-in for the Oracle connections returned by utils.db.get_connection.
+# It speaks the subset of DB-API and Oracle SQL that the jobs use (positional/named binds,
+# fetchmany, executemany, ROWNUM, user_tables/user_tab_columns, single-row MERGE) and can add
+# a fixed delay per round trip so network-bound behaviour such as parallel copies can be
+# measured without Oracle.
+
+_ROWNUM = re.compile(r"\s+WHERE\s+ROWNUM\s*(?:=|<=)\s*(\d+)", re.IGNORECASE)
+_FETCH_FIRST = re.compile(r"\s+FETCH\s+FIRST\s+(\S+)\s+ROWS\s+ONLY", re.IGNORECASE)
+_FROM_DUAL = re.compile(r"\s+FROM\s+dual\b", re.IGNORECASE)
+_BIND = re.compile(r"(?<![:\w]):(\w+)")
+_MERGE = re.compile(
+    r"MERGE\s+INTO\s+(\w+)\s+\w+\s+USING\s+\(SELECT\s+(.+?)\s+FROM\s+dual\)\s+\w+\s+"
+    r"ON\s+\(\w+\.(\w+)\s*=\s*\w+\.\w+\)", re.IGNORECASE | re.DOTALL)
+
+_VIEWS = [
+    """CREATE VIEW IF NOT EXISTS user_tables AS
+       SELECT upper(name) AS table_name FROM sqlite_master WHERE type = 'table'""",
+    """CREATE VIEW IF NOT EXISTS user_tab_columns AS
+       SELECT upper(m.name) AS table_name,
+              upper(p.name) AS column_name,
+              CASE WHEN instr(p.type, '(') > 0 THEN substr(p.type, 1, instr(p.type, '(') - 1) ELSE p.type END AS data_type,
+              CASE WHEN instr(p.type, '(') > 0 THEN CAST(substr(p.type, instr(p.type, '(') + 1) AS INTEGER) END AS data_length,
+              p.cid AS column_id
+       FROM sqlite_master m, pragma_table_info(m.name) p
+       WHERE m.type = 'table'""",
+]
+
+
+# Single-row MERGE ... USING (SELECT :1 AS c1, ... FROM dual) becomes an SQLite upsert on the key.
+# Like the MERGE built by the jobs, a matched row is only updated when a column differs
+# (IS NOT compares NULLs as equal, as DECODE does) and a key-only row is left alone.
+def _translate_merge(match):
+    table, select_list, key = match.group(1), match.group(2), match.group(3)
+    columns = re.findall(r"AS\s+(\w+)", select_list, re.IGNORECASE)
+    value_columns = [c for c in columns if c.upper() != key.upper()]
+    insert = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['?'] * len(columns))}) "
+    if not value_columns:
+        return insert + f"ON CONFLICT({key}) DO NOTHING"
+    updates = ", ".join([f"{c} = excluded.{c}" for c in value_columns])
+    changed = " OR ".join([f"{c} IS NOT excluded.{c}" for c in value_columns])
+    return insert + f"ON CONFLICT({key}) DO UPDATE SET {updates} WHERE {changed}"
+
+
+# Rewrite the Oracle specific parts of a statement for SQLite
+def translate(sql, params=None):
+    merge = _MERGE.match(sql.strip())
+    if merge:
+        return _translate_merge(merge)
+    sql = _ROWNUM.sub(r" LIMIT \1", sql)
+    sql = _FETCH_FIRST.sub(r" LIMIT \1", sql)
+    sql = _FROM_DUAL.sub("", sql)
+    if params is None or isinstance(params, (list, tuple)):
+        # Oracle binds a sequence by position of appearance, whatever the placeholder names
+        sql = _BIND.sub("?", sql)
+    return sql
+
+
+class StandInCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self._cursor = connection._conn.cursor()
+        self.arraysize = 100
+        self.prefetchrows = 2
+        self.round_trips = 0
+
+    def _round_trip(self):
+        self.round_trips += 1
+        self.connection.database.count_round_trip()
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    def setinputsizes(self, *args, **kwargs):
+        pass
+
+    def execute(self, sql, params=None):
+        self._round_trip()
+        self._cursor.execute(translate(sql, params), params or [])
+        return self
+
+    def executemany(self, sql, rows, **kwargs):
+        self._round_trip()
+        rows = list(rows)
+        if rows:
+            self._cursor.executemany(translate(sql, rows[0]), rows)
+
+    def fetchone(self):
+        self._round_trip()
+        return self._cursor.fetchone()
+
+    def fetchmany(self, size=None):
+        self._round_trip()
+        return self._cursor.fetchmany(size or self.arraysize)
+
+    def fetchall(self):
+        self._round_trip()
+        return self._cursor.fetchall()
+
+    def __iter__(self):
+        while True:
+            rows = self.fetchmany()
+            if not rows:
+                return
+            yield from rows
+
+    def close(self):
+        self._cursor.close()
+
+
+class StandInConnection:
+    def __init__(self, database):
+        self.database = database
+        self._conn = sqlite3.connect(database.path, timeout=120, check_same_thread=False)
+
+    def cursor(self):
+        return StandInCursor(self)
+
+    def commit(self):
+        self.database.count_round_trip()
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def close(self):
+        self._conn.close()
+
+
+class StandInDatabase:
+    def __init__(self, path, latency=0.0):
+        self.path = str(path)
+        self.latency = latency
+        self.round_trips = 0
+        self._lock = threading.Lock()
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        for view in _VIEWS:
+            conn.execute(view)
+        conn.commit()
+        conn.close()
+
+    def count_round_trip(self):
+        with self._lock:
+            self.round_trips += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def connect(self):
+        return StandInConnection(self)
+
+
+# Patch get_connection in utils.db and in every module that imported it by name,
+# so the jobs use the stand-in databases instead of Oracle.
+def install(databases, modules):
+    def get_connection(type):
+        return databases[type].connect()
+    for module in modules:
+        module.get_connection = get_connection
+    return get_connection
@@ -0,0 +1,33 @@
+import random
+
+# Synthetic data for the job benchmarks: a CUSTOMER table shaped like the one in the README
+# and a CSV shaped like app/files/data.csv
+
+NAMES = ["John Smith", "Alice Johnson", "Michael Brown", "Emily Davis", "Ravi Kumar", "Maria Garcia"]
+COMPANIES = ["NextGen Solutions", "CloudNet", "TechCorp", "FinServe", "InnoSoft"]
+DESIGNATIONS = ["Data Analyst", "Software Engineer", "Manager", "Consultant"]
+CITIES = ["New York", "Sydney", "Toronto", "London", "Bangalore"]
+COUNTRIES = ["Canada", "Germany", "Japan", "India", "USA"]
+
+
+def create_customer_table(database, rows, table="CUSTOMER"):
+    conn = database.connect()
+    conn._conn.execute(f"""
+        CREATE TABLE {table} (
+            ID NUMBER PRIMARY KEY, NAME VARCHAR2(100), EMAIL VARCHAR2(100), PHONE VARCHAR2(20),
+            COMPANY VARCHAR2(100), CITY VARCHAR2(50), COUNTRY VARCHAR2(50))""")
+    conn._conn.executemany(
+        f"INSERT INTO {table} VALUES (?, ?, ?, ?, ?, ?, ?)",
+        ((i, f"Customer {i}", f"customer{i}@example.com", f"+1-202-555-{i % 10000:04d}",
+          f"Company {i % 500}", f"City {i % 100}", f"Country {i % 20}") for i in range(1, rows + 1)))
+    conn.commit()
+    conn.close()
+
+
+def generate_csv(path, rows):
+    rnd = random.Random(42)
+    with open(path, "w") as f:
+        f.write("ID,Name,Age,Company,Designation,City,Country\n")
+        for i in range(1, rows + 1):
+            f.write(f"{i},{rnd.choice(NAMES)},{rnd.randint(21, 60)},{rnd.choice(COMPANIES)},"
+                    f"{rnd.choice(DESIGNATIONS)},{rnd.choice(CITIES)},{rnd.choice(COUNTRIES)}\n")
@@ -4,6 +4,24 @@ class BaseConfig(BaseSettings):
     app_name: str = "My FastAPI App"
     debug: bool = False
 
+    # Oracle connection pool
+    pool_min: int = 2
+    pool_max: int = 10
+    pool_increment: int = 1
+    pool_stmt_cache_size: int = 50
+    pool_ping_interval: int = 60        # seconds idle before a connection is pinged on acquire
+    pool_wait_timeout: int = 5000       # milliseconds to wait for a free connection
+
+    # Largest number of rows accepted by one bulk create request
+    bulk_max_rows: int = 10000
+
+    # Product and review read cache
+    cache_enabled: bool = True
+    cache_backend: str = "memory"       # "memory" (per worker) or "redis" (shared by all workers)
+    cache_max_size: int = 10000         # entries kept by the memory backend
+    cache_ttl: int = 60                 # seconds an entry is served before it is read again
+    cache_redis_url: str = "redis://localhost:6379/0"
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
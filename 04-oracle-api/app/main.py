@@ -1,15 +1,28 @@
 import logging
 from fastapi import FastAPI
+from contextlib import asynccontextmanager
 from app.logger import setup_logging
-from app.routers import products, reviews
-
-app = FastAPI(title="Product Review API")
+from app.services import db
+from app.services.metrics import MetricsMiddleware
+from app.routers import products, reviews, monitoring
 
 setup_logging()
 logger = logging.getLogger("main")
 
+# Create the async connection pool on startup and close it on shutdown
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    db.create_async_pool()
+    yield
+    await db.close_async_pool()
+
+app = FastAPI(title="Product Review API", lifespan=lifespan)
+app.add_middleware(MetricsMiddleware)
+
 # Routers
 app.include_router(products.router)
 app.include_router(reviews.router)
+app.include_router(monitoring.router)
+app.include_router(monitoring.metrics_router)
 
-# Run with: uvicorn app.main:app --reload
\ No newline at end of file
+# Run with: uvicorn app.main:app --reload
@@ -1,9 +1,9 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 
 class Review(BaseModel):
     id: Optional[int] = None
     product_id: Optional[int] = None
     comment: str
-    rating: int
+    rating: int = Field(ge=1, le=5)
     comment_by: str
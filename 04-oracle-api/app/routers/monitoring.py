@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.services import db, cache, metrics
+
+router = APIRouter(prefix="/monitoring", tags=["Monitoring"])
+# Prometheus scrapes /metrics at the root
+metrics_router = APIRouter(tags=["Monitoring"])
+
+@router.get("/pool", response_model=dict)
+async def get_pool_stats():
+    return db.pool_stats()
+
+@router.get("/cache", response_model=dict)
+async def get_cache_stats():
+    return await cache.cache_stats()
+
+@metrics_router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
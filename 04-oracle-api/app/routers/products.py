@@ -1,28 +1,103 @@
-from fastapi import APIRouter, HTTPException
+import orjson
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse, ORJSONResponse
 from app.models.product import Product
-from app.services import product_service
+from app.services import product_service, review_service
+from app.config import get_config
 
 router = APIRouter(prefix="/products", tags=["Products"])
+config = get_config()
 
 @router.post("/", response_model=dict)
-def create_product(product: Product):
-    return product_service.create_product(product)
+async def create_product(product: Product):
+    return await product_service.create_product(product)
+
+# Creates many products in one request; each row is reported with its new id or its error
+@router.post("/bulk", response_model=dict)
+async def create_products(products: list[Product]):
+    if len(products) > config.bulk_max_rows:
+        raise HTTPException(status_code=413, detail=f"At most {config.bulk_max_rows} products per request")
+    return await product_service.create_products(products)
+
+INCLUDES = {"reviews"}
+
+# include is a comma separated list of related data to embed, e.g. include=reviews
+def parse_include(include: Optional[str]):
+    includes = set(include.split(",")) if include else set()
+    unknown = includes - INCLUDES
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unsupported include: {', '.join(sorted(unknown))}")
+    return includes
+
+# Adds "reviews" to every product of a batch with one query for the whole batch
+async def with_reviews(products: list):
+    reviews = await review_service.get_reviews_by_products([product["id"] for product in products])
+    return [{**product, "reviews": reviews[product["id"]]} for product in products]
 
 @router.get("/{product_id}", response_model=dict)
-def get_product(product_id: int):
-    product = product_service.get_product(product_id)
+async def get_product(product_id: int, include: Optional[str] = None):
+    includes = parse_include(include)
+    product = await product_service.get_product(product_id)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
+    if "reviews" in includes:
+        return {**product, "reviews": await review_service.get_reviews_by_product(product_id)}
     return product
 
-@router.get("/", response_model=list)
-def get_all_products():
-    return product_service.get_all_products()
+# Review count, average and star histogram, kept up to date as reviews are added and deleted
+@router.get("/{product_id}/rating", response_model=dict)
+async def get_product_rating(product_id: int):
+    product = await product_service.get_product(product_id)
+    if not product:
+        raise HTTPException(status_code=404, detail="Product not found")
+    return product["rating"]
+
+# Product batches as they are fetched, with their reviews when asked for
+async def product_batches(after_id: Optional[int], includes: set):
+    async for batch in product_service.iter_products(after_id):
+        yield await with_reviews(batch) if "reviews" in includes else batch
+
+# Products as NDJSON, one line per product, written batch by batch as they are fetched
+async def stream_ndjson(after_id: Optional[int], includes: set):
+    async for batch in product_batches(after_id, includes):
+        yield b"".join(orjson.dumps(product, option=orjson.OPT_APPEND_NEWLINE) for product in batch)
+
+# The full list as one JSON array, also written batch by batch instead of built in memory
+async def stream_json_array(includes: set):
+    separator = b"["
+    async for batch in product_batches(None, includes):
+        # one orjson call per batch, without the batch's own brackets
+        yield separator + orjson.dumps(batch)[1:-1]
+        separator = b","
+    yield b"[]" if separator == b"[" else b"]"
+
+# Pass limit/after_id for keyset pagination or stream=true for an NDJSON stream.
+# Without them the whole catalog is returned as a JSON list, as before.
+# include=reviews embeds each product's reviews, read with one query per page or batch.
+@router.get("/")
+async def get_all_products(
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    after_id: Optional[int] = None,
+    stream: bool = False,
+    include: Optional[str] = None,
+):
+    includes = parse_include(include)
+    if stream:
+        return StreamingResponse(stream_ndjson(after_id, includes), media_type="application/x-ndjson")
+    if limit is not None or after_id is not None:
+        products, next_after_id = await product_service.get_products_page(limit or 100, after_id)
+        if "reviews" in includes:
+            products = await with_reviews(products)
+        # the rows are already in their response shape: encode them with orjson, skipping FastAPI's
+        # response validation and jsonable_encoder pass
+        return ORJSONResponse({"items": products, "next_after_id": next_after_id})
+    return StreamingResponse(stream_json_array(includes), media_type="application/json")
 
 @router.put("/{product_id}", response_model=dict)
-def update_product(product_id: int, product: Product):
-    return product_service.update_product(product_id, product)
+async def update_product(product_id: int, product: Product):
+    return await product_service.update_product(product_id, product)
 
 @router.delete("/{product_id}", response_model=dict)
-def delete_product(product_id: int):
-    return product_service.delete_product(product_id)
+async def delete_product(product_id: int):
+    return await product_service.delete_product(product_id)
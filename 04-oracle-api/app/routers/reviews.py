@@ -1,14 +1,31 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import ORJSONResponse
 from app.models.review import Review
 from app.services import review_service
+from app.config import get_config
 
 router = APIRouter(prefix="/products/{product_id}/reviews", tags=["Reviews"])
+config = get_config()
 
 @router.post("/", response_model=dict)
-def create_review(product_id: int, review: Review):
+async def create_review(product_id: int, review: Review):
     review.product_id = product_id
-    return review_service.create_review(review)
+    return await review_service.create_review(review)
+
+# Creates many reviews of one product in one request; each row is reported with its new id or its error
+@router.post("/bulk", response_model=dict)
+async def create_reviews(product_id: int, reviews: list[Review]):
+    if len(reviews) > config.bulk_max_rows:
+        raise HTTPException(status_code=413, detail=f"At most {config.bulk_max_rows} reviews per request")
+    return await review_service.create_reviews(product_id, reviews)
 
 @router.get("/", response_model=list)
-def get_reviews(product_id: int):
-    return review_service.get_reviews_by_product(product_id)
+async def get_reviews(product_id: int):
+    return ORJSONResponse(await review_service.get_reviews_by_product(product_id))
+
+@router.delete("/{review_id}", response_model=dict)
+async def delete_review(product_id: int, review_id: int):
+    deleted = await review_service.delete_review(product_id, review_id)
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Review not found")
+    return deleted
@@ -0,0 +1,56 @@
+import logging
+from app.config import get_config
+from app.services.cache_backend import MemoryCache, RedisCache
+
+logger = logging.getLogger(__name__)
+config = get_config()
+
+# Read-through cache for product and review lookups.
+# The backend (app/services/cache_backend.py) is picked by the cache settings: "memory" for an
+# LRU inside each worker process, "redis" for entries shared by all workers.
+
+
+def create_cache():
+    if not config.cache_enabled:
+        return None
+    if config.cache_backend == "redis":
+        logger.info(f"Using the redis cache at {config.cache_redis_url}")
+        return RedisCache(config.cache_redis_url, config.cache_ttl)
+    return MemoryCache(config.cache_max_size, config.cache_ttl)
+
+
+cache = create_cache()
+
+
+def product_key(product_id):
+    return f"product:{product_id}"
+
+
+def reviews_key(product_id):
+    return f"reviews:{product_id}"
+
+
+# Return the cached value for key, or call load() and cache what it returns (None is not cached)
+async def get_or_load(key, load):
+    if cache is None:
+        return await load()
+    found, value = await cache.get(key)
+    if found:
+        return value
+    version = await cache.version(key)
+    value = await load()
+    if value is not None:
+        await cache.set(key, value, version)
+    return value
+
+
+# Called after the change is committed, so a reader cannot cache the old row again
+async def invalidate(*keys):
+    if cache is not None:
+        await cache.delete(*keys)
+
+
+async def cache_stats():
+    if cache is None:
+        return {"backend": None}
+    return await cache.info()
@@ -1,26 +1,153 @@
+import time
 import oracledb
 import logging
+import threading
 from app.config import get_config
-from contextlib import contextmanager
+from app.services import metrics
+from contextlib import asynccontextmanager
 
 logger = logging.getLogger(__name__)
 config = get_config()
 
-def get_connection():
-    return oracledb.connect(user=config.oracle_user, password=config.oracle_password, dsn=config.oracle_dsn)
+async_pool = None
+_stats_lock = threading.Lock()
+_acquire_stats = {"acquires": 0, "wait_total": 0.0, "wait_max": 0.0}
 
-@contextmanager
-def get_cursor():
-    conn = get_connection()
-    cursor = conn.cursor()
+def _pool_params():
+    return dict(
+        user=config.oracle_user,
+        password=config.oracle_password,
+        dsn=config.oracle_dsn,
+        min=config.pool_min,
+        max=config.pool_max,
+        increment=config.pool_increment,
+        stmtcachesize=config.pool_stmt_cache_size,
+        ping_interval=config.pool_ping_interval,
+        getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+        wait_timeout=config.pool_wait_timeout,
+    )
+
+# Pool of asyncio connections used by the request path: a coroutine waiting on the
+# database gives the event loop back, so one worker keeps many queries in flight
+def create_async_pool():
+    global async_pool
+    async_pool = oracledb.create_pool_async(**_pool_params())
+    logger.info(f"Async connection pool created (min={config.pool_min}, max={config.pool_max})")
+    return async_pool
+
+async def close_async_pool():
+    global async_pool
+    if async_pool is not None:
+        await async_pool.close()
+        async_pool = None
+        logger.info("Async connection pool closed")
+
+def _record_wait(wait):
+    with _stats_lock:
+        _acquire_stats["acquires"] += 1
+        _acquire_stats["wait_total"] += wait
+        _acquire_stats["wait_max"] = max(_acquire_stats["wait_max"], wait)
+
+async def get_async_connection():
+    start = time.perf_counter()
+    if async_pool is None:
+        conn = await oracledb.connect_async(user=config.oracle_user, password=config.oracle_password,
+                                            dsn=config.oracle_dsn)
+    else:
+        conn = await async_pool.acquire()
+        _record_wait(time.perf_counter() - start)
+    metrics.ACQUIRE_WAIT.observe(time.perf_counter() - start)
+    return conn
+
+def pool_stats():
+    with _stats_lock:
+        stats = dict(_acquire_stats)
+    stats["avg_wait_ms"] = stats["wait_total"] / stats["acquires"] * 1000 if stats["acquires"] else 0.0
+    stats["max_wait_ms"] = stats.pop("wait_max") * 1000
+    stats.pop("wait_total")
+    if async_pool is not None:
+        stats.update({"open": async_pool.opened, "busy": async_pool.busy, "min": async_pool.min,
+                      "max": async_pool.max})
+    return stats
+
+# Cursor wrapper that times execute/executemany and counts driver calls and fetched rows for
+# GET /metrics; everything else (var, setinputsizes, rowfactory, ...) goes to the real cursor
+class MeteredAsyncCursor:
+    def __init__(self, cursor):
+        object.__setattr__(self, "_cursor", cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._cursor, name, value)
+
+    async def execute(self, statement, parameters=None, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await self._cursor.execute(statement, parameters, **kwargs)
+        finally:
+            metrics.QUERY_DURATION.observe(time.perf_counter() - start, metrics.query_operation(statement))
+            metrics.ROUND_TRIPS.inc(1, "execute")
+
+    async def executemany(self, statement, parameters, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await self._cursor.executemany(statement, parameters, **kwargs)
+        finally:
+            metrics.QUERY_DURATION.observe(time.perf_counter() - start, metrics.query_operation(statement))
+            metrics.ROUND_TRIPS.inc(1, "executemany")
+
+    async def fetchone(self):
+        row = await self._cursor.fetchone()
+        metrics.ROUND_TRIPS.inc(1, "fetch")
+        metrics.ROWS_FETCHED.inc(0 if row is None else 1)
+        return row
+
+    async def fetchmany(self, size=None):
+        rows = await self._cursor.fetchmany(size) if size else await self._cursor.fetchmany()
+        metrics.ROUND_TRIPS.inc(1, "fetch")
+        metrics.ROWS_FETCHED.inc(len(rows))
+        return rows
+
+    async def fetchall(self):
+        rows = await self._cursor.fetchall()
+        metrics.ROUND_TRIPS.inc(1, "fetch")
+        metrics.ROWS_FETCHED.inc(len(rows))
+        return rows
+
+@asynccontextmanager
+async def get_async_cursor():
+    conn = await get_async_connection()
+    cursor = MeteredAsyncCursor(conn.cursor())
     try:
         yield cursor
-        conn.commit()
+        await conn.commit()
+        metrics.ROUND_TRIPS.inc(1, "commit")
         logger.info("Query executed successfully")
     except Exception as e:
-        conn.rollback()
-        logger.error("Error in executing the query:", e)
+        await conn.rollback()
+        metrics.ROUND_TRIPS.inc(1, "rollback")
+        logger.error(f"Error in executing the query: {e}")
         raise e
     finally:
         cursor.close()
-        conn.close()
\ No newline at end of file
+        await conn.close()
+
+# Array DML for the bulk endpoints: one executemany round trip for all rows. sql ends with
+# RETURNING id INTO :n and rows carry the other binds. With batcherrors a failing row does not
+# stop the others; each row is reported with its new id or its error.
+async def insert_many(cur, sql, rows):
+    if not rows:
+        return {"inserted": 0, "failed": 0, "results": []}
+    out_ids = cur.var(int, arraysize=len(rows))
+    cur.setinputsizes(*([None] * len(rows[0])), out_ids)
+    await cur.executemany(sql, rows, batcherrors=True)
+    errors = {error.offset: error.message for error in cur.getbatcherrors()}
+    results = []
+    for index in range(len(rows)):
+        if index in errors:
+            results.append({"index": index, "error": errors[index]})
+        else:
+            results.append({"index": index, "id": out_ids.getvalue(index)[0]})
+    return {"inserted": len(rows) - len(errors), "failed": len(errors), "results": results}
@@ -0,0 +1,127 @@
+import time
+import bisect
+import threading
+
+# In-process request and database metrics rendered in the Prometheus text format at GET /metrics.
+# Recording a value is a bisect and a few additions under a lock, cheap enough to leave on.
+# Each uvicorn worker keeps its own numbers; Prometheus scrapes them per worker.
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_lock = threading.Lock()
+
+
+class Histogram:
+    def __init__(self, name, help, labels, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        # label values -> [count per bucket (+Inf last), sum]
+        self._series = {}
+
+    def observe(self, value, *label_values):
+        with _lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][bisect.bisect_left(self.buckets, value)] += 1
+            series[1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with _lock:
+            series = [(values, counts[:], total) for values, (counts, total) in self._series.items()]
+        for values, counts, total in sorted(series):
+            labels = _labels(self.labels, values)
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                le = f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{{{labels + ',' if labels else ''}{le}}} {cumulative}")
+            suffix = f"{{{labels}}}" if labels else ""
+            lines.append(f"{self.name}_sum{suffix} {total}")
+            lines.append(f"{self.name}_count{suffix} {cumulative}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name, help, labels):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values = {}
+
+    def inc(self, amount, *label_values):
+        with _lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with _lock:
+            values = sorted(self._values.items())
+        for label_values, value in values:
+            labels = _labels(self.labels, label_values)
+            lines.append(f"{self.name}{{{labels}}} {value}" if labels else f"{self.name} {value}")
+        return lines
+
+
+def _labels(names, values):
+    return ",".join(f'{name}="{value}"' for name, value in zip(names, values))
+
+
+REQUEST_DURATION = Histogram("http_request_duration_seconds",
+                             "Time from receiving the request to sending the last byte of the response",
+                             ["method", "route", "status"])
+QUERY_DURATION = Histogram("db_query_duration_seconds", "Time spent in execute/executemany",
+                           ["operation"])
+ACQUIRE_WAIT = Histogram("db_connection_acquire_seconds", "Time waiting for a pooled connection", [])
+ROUND_TRIPS = Counter("db_round_trips_total",
+                      "Database calls made (execute, fetch, commit, rollback); an upper bound of network round trips",
+                      ["call"])
+ROWS_FETCHED = Counter("db_rows_fetched_total", "Rows returned by fetchone/fetchmany/fetchall", [])
+METRICS = [REQUEST_DURATION, QUERY_DURATION, ACQUIRE_WAIT, ROUND_TRIPS, ROWS_FETCHED]
+
+
+def render():
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def query_operation(statement):
+    return statement.lstrip().split(None, 1)[0].upper() if statement else "UNKNOWN"
+
+
+# Pure ASGI middleware (no BaseHTTPMiddleware task/queue per request), labelled by the route
+# template such as /products/{product_id} so the number of series stays bounded. Streaming
+# responses are timed until their last chunk is sent.
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        start = time.perf_counter()
+        state = {"status": 500, "observed": False}
+
+        def observe():
+            if not state["observed"]:
+                state["observed"] = True
+                route = scope.get("route")
+                REQUEST_DURATION.observe(time.perf_counter() - start, scope["method"],
+                                         route.path if route is not None else "unmatched", state["status"])
+
+        async def send_with_metrics(message):
+            if message["type"] == "http.response.start":
+                state["status"] = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                observe()
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            observe()
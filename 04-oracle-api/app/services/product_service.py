@@ -1,50 +1,113 @@
 import logging
-from app.services.db import get_cursor
+from app.services.db import get_async_cursor, insert_many
+from app.services.cache import get_or_load, invalidate, product_key, reviews_key
+from app.services.rating_service import create_summaries, to_summary
 from app.models.product import Product
 
 logger = logging.getLogger(__name__)
 
-def create_product(product: Product):
+FETCH_BATCH_SIZE = 500
+
+# Row factory: the cursor hands back each product already in its response shape
+def product_row(id, name, description, price):
+    return {"id": id, "name": name, "description": description, "price": price}
+
+async def create_product(product: Product):
     try:
-        with get_cursor() as cur:
+        async with get_async_cursor() as cur:
             out_id = cur.var(int)
-            cur.execute(
+            await cur.execute(
                 "INSERT INTO product (name, description, price) VALUES (:1, :2, :3) RETURNING id INTO :4",
                 [product.name, product.description, product.price, out_id]
             )
             product_id = out_id.getvalue()[0]
+            await create_summaries(cur, [product_id])
             logger.info(f"product {product_id} was created successfully")
             return {**product.dict(), "id": product_id}
     except Exception as e:
         print(e)
 
-def get_product(product_id: int):
-    with get_cursor() as cur:
-        cur.execute("SELECT id, name, description, price FROM product WHERE id = :1", [product_id])
-        row = cur.fetchone()
+# Inserts all products with one array DML statement in one transaction
+async def create_products(products: list[Product]):
+    rows = [[product.name, product.description, product.price] for product in products]
+    async with get_async_cursor() as cur:
+        result = await insert_many(
+            cur, "INSERT INTO product (name, description, price) VALUES (:1, :2, :3) RETURNING id INTO :4", rows
+        )
+        await create_summaries(cur, [row["id"] for row in result["results"] if "id" in row])
+    logger.info(f"{result['inserted']} products were created, {result['failed']} failed")
+    return result
+
+async def get_product(product_id: int):
+    return await get_or_load(product_key(product_id), lambda: _fetch_product(product_id))
+
+# The product with its rating summary, read together in one round trip
+async def _fetch_product(product_id: int):
+    async with get_async_cursor() as cur:
+        await cur.execute(
+            "SELECT p.id, p.name, p.description, p.price, r.review_count, r.rating_sum, "
+            "r.stars_1, r.stars_2, r.stars_3, r.stars_4, r.stars_5 "
+            "FROM product p LEFT JOIN product_rating r ON r.product_id = p.id WHERE p.id = :1",
+            [product_id]
+        )
+        row = await cur.fetchone()
         logger.info(f"product {product_id} was retrieved successfully")
-        return dict(zip(["id", "name", "description", "price"], row)) if row else None
-
-def get_all_products():
-    with get_cursor() as cur:
-        cur.execute("SELECT id, name, description, price FROM product")
-        rows = cur.fetchall()
-        logger.info(f"All products are retrieved successfully")
-        return [dict(zip(["id", "name", "description", "price"], row)) for row in rows]
-
-def update_product(product_id: int, product: Product):
-    with get_cursor() as cur:
-        cur.execute(
+        if not row:
+            return None
+        return {**product_row(*row[:4]), "rating": to_summary(row[4:])}
+
+# One page of products in id order, starting after after_id (keyset pagination).
+# Returns the products and the id to pass as after_id for the next page (None on the last page).
+async def get_products_page(limit: int, after_id: int = None):
+    async with get_async_cursor() as cur:
+        # one extra row tells whether there is a next page
+        await cur.execute(
+            "SELECT id, name, description, price FROM product WHERE id > :1 ORDER BY id FETCH FIRST :2 ROWS ONLY",
+            [after_id if after_id is not None else 0, limit + 1]
+        )
+        # execute() resets the row factory, so it is set afterwards
+        cur.rowfactory = product_row
+        rows = await cur.fetchall()
+    next_after_id = rows[limit - 1]["id"] if len(rows) > limit else None
+    logger.info(f"{min(len(rows), limit)} products after {after_id} are retrieved successfully")
+    return rows[:limit], next_after_id
+
+# Yields the products in id order as lists of at most batch_size, fetched with fetchmany,
+# so only one batch is held in memory however large the table is
+async def iter_products(after_id: int = None, batch_size: int = FETCH_BATCH_SIZE):
+    async with get_async_cursor() as cur:
+        cur.arraysize = batch_size
+        cur.prefetchrows = batch_size
+        await cur.execute(
+            "SELECT id, name, description, price FROM product WHERE id > :1 ORDER BY id",
+            [after_id if after_id is not None else 0]
+        )
+        cur.rowfactory = product_row
+        count = 0
+        while True:
+            rows = await cur.fetchmany(batch_size)
+            if not rows:
+                break
+            count += len(rows)
+            yield rows
+    logger.info(f"{count} products are streamed successfully")
+
+async def update_product(product_id: int, product: Product):
+    async with get_async_cursor() as cur:
+        await cur.execute(
             "UPDATE product SET name=:1, description=:2, price=:3 WHERE id=:4",
             [product.name, product.description, product.price, product_id]
         )
-        logger.info(f"product {product_id} was updated successfully")
-        return {"updated_id": product_id}
-
-def delete_product(product_id: int):
-    with get_cursor() as cur:
-        # delete reviews first
-        cur.execute("DELETE FROM product_review WHERE product_id=:1", [product_id])
-        cur.execute("DELETE FROM product WHERE id=:1", [product_id])
-        logger.info(f"product {product_id} was removed successfully")
-        return {"deleted_id": product_id}
+    await invalidate(product_key(product_id))
+    logger.info(f"product {product_id} was updated successfully")
+    return {"updated_id": product_id}
+
+async def delete_product(product_id: int):
+    async with get_async_cursor() as cur:
+        # delete reviews and the rating summary first
+        await cur.execute("DELETE FROM product_review WHERE product_id=:1", [product_id])
+        await cur.execute("DELETE FROM product_rating WHERE product_id=:1", [product_id])
+        await cur.execute("DELETE FROM product WHERE id=:1", [product_id])
+    await invalidate(product_key(product_id), reviews_key(product_id))
+    logger.info(f"product {product_id} was removed successfully")
+    return {"deleted_id": product_id}
@@ -0,0 +1,66 @@
+import logging
+import oracledb
+
+logger = logging.getLogger(__name__)
+
+# Per-product rating summary kept in PRODUCT_RATING (review count, rating sum and how many
+# reviews gave 1 to 5 stars). It is changed in the same transaction as the reviews, so reading
+# it costs one row whatever the number of reviews.
+
+STAR_COLUMNS = ["stars_1", "stars_2", "stars_3", "stars_4", "stars_5"]
+SUMMARY_COLUMNS = ["review_count", "rating_sum"] + STAR_COLUMNS
+
+ADD_TO_SUMMARY = (
+    "UPDATE product_rating SET review_count = review_count + :1, rating_sum = rating_sum + :2, "
+    "stars_1 = stars_1 + :3, stars_2 = stars_2 + :4, stars_3 = stars_3 + :5, stars_4 = stars_4 + :6, "
+    "stars_5 = stars_5 + :7 WHERE product_id = :8"
+)
+
+BUILD_SUMMARY = (
+    "INSERT INTO product_rating (product_id, review_count, rating_sum, stars_1, stars_2, stars_3, stars_4, stars_5) "
+    "SELECT :1, COUNT(*), COALESCE(SUM(rating), 0), "
+    "COUNT(CASE WHEN rating = 1 THEN 1 END), COUNT(CASE WHEN rating = 2 THEN 1 END), "
+    "COUNT(CASE WHEN rating = 3 THEN 1 END), COUNT(CASE WHEN rating = 4 THEN 1 END), "
+    "COUNT(CASE WHEN rating = 5 THEN 1 END) FROM product_review WHERE product_id = :2"
+)
+
+
+# Creates the empty summaries of new products, in the transaction that inserts them
+async def create_summaries(cur, product_ids: list):
+    if product_ids:
+        await cur.executemany("INSERT INTO product_rating (product_id) VALUES (:1)",
+                              [[product_id] for product_id in product_ids])
+
+
+# Adds the ratings of new reviews (sign=1) or removes those of deleted reviews (sign=-1)
+async def apply_ratings(cur, product_id: int, ratings: list, sign: int = 1):
+    if not ratings:
+        return
+    deltas = [sign * len(ratings), sign * sum(ratings)] + [sign * ratings.count(star) for star in range(1, 6)]
+    await cur.execute(ADD_TO_SUMMARY, deltas + [product_id])
+    if cur.rowcount == 0:
+        # a product created before the summaries existed: build its row from the reviews,
+        # which already include this change
+        try:
+            await cur.execute(BUILD_SUMMARY, [product_id, product_id])
+        except oracledb.IntegrityError as e:
+            if not _is_unique_violation(e):
+                raise
+            # a concurrent first review built the row first, from the reviews committed before
+            # ours, so ours still has to be added to it
+            await cur.execute(ADD_TO_SUMMARY, deltas + [product_id])
+    logger.info(f"Rating summary of product {product_id} was updated with {sign * len(ratings)} reviews")
+
+
+def _is_unique_violation(error):
+    return getattr(error.args[0], "full_code", None) == "ORA-00001" if error.args else False
+
+
+# The API view of a summary row: count, average and the 1 to 5 star histogram
+def to_summary(values):
+    count, total, *stars = [value or 0 for value in values]
+    return {
+        "count": count,
+        "average": round(total / count, 2) if count else None,
+        "histogram": {str(star): stars[star - 1] for star in range(1, 6)},
+    }
@@ -1,29 +1,91 @@
 import logging
 from app.models.review import Review
-from app.services.db import get_cursor
+from app.services.db import get_async_cursor, insert_many
+from app.services.cache import get_or_load, invalidate, product_key, reviews_key
+from app.services.rating_service import apply_ratings
 
 logger = logging.getLogger(__name__)
 
-def create_review(review: Review):
-    with get_cursor() as cur:
+# Oracle accepts at most 1000 expressions in an IN list
+IN_LIST_SIZE = 1000
+
+# Row factory: the cursor hands back each review already in its response shape
+def review_row(id, product_id, comment, rating, comment_by):
+    return {"id": id, "product_id": product_id, "comment": comment, "rating": rating, "comment_by": comment_by}
+
+async def create_review(review: Review):
+    async with get_async_cursor() as cur:
         out_id = cur.var(int)
-        cur.execute(
+        await cur.execute(
             "INSERT INTO product_review (product_id, comments, rating, comment_by) VALUES (:1, :2, :3, :4) RETURNING id INTO :5",
             [review.product_id, review.comment, review.rating, review.comment_by, out_id]
         )
         review_id = out_id.getvalue()[0]
-        logger.info(f"Product {review.product_id} of review {review_id} was created successfully")
-        return {**review.dict(), "id": review_id}
-
-def delete_review(review_id: int):
-    with get_cursor() as cur:
-        cur.execute("DELETE FROM reviews WHERE id=:1", [review_id])
-        logger.info(f"Review {review_id} was removed successfully")
-        return {"deleted_id": review_id}
-
-def get_reviews_by_product(product_id: int):
-    with get_cursor() as cur:
-        cur.execute("SELECT id, product_id, comments, rating, comment_by FROM product_review WHERE product_id=:1", [product_id])
-        rows = cur.fetchall()
+        await apply_ratings(cur, review.product_id, [review.rating])
+    await invalidate(reviews_key(review.product_id), product_key(review.product_id))
+    logger.info(f"Product {review.product_id} of review {review_id} was created successfully")
+    return {**review.dict(), "id": review_id}
+
+# Inserts all reviews of a product with one array DML statement in one transaction
+async def create_reviews(product_id: int, reviews: list[Review]):
+    rows = [[product_id, review.comment, review.rating, review.comment_by] for review in reviews]
+    async with get_async_cursor() as cur:
+        result = await insert_many(
+            cur,
+            "INSERT INTO product_review (product_id, comments, rating, comment_by) VALUES (:1, :2, :3, :4) RETURNING id INTO :5",
+            rows
+        )
+        await apply_ratings(cur, product_id, [reviews[row["index"]].rating for row in result["results"] if "id" in row])
+    if result["inserted"]:
+        await invalidate(reviews_key(product_id), product_key(product_id))
+    logger.info(f"{result['inserted']} reviews of product {product_id} were created, {result['failed']} failed")
+    return result
+
+# Returns None when the product has no such review
+async def delete_review(product_id: int, review_id: int):
+    async with get_async_cursor() as cur:
+        out_rating = cur.var(int)
+        await cur.execute(
+            "DELETE FROM product_review WHERE id=:1 AND product_id=:2 RETURNING rating INTO :3",
+            [review_id, product_id, out_rating]
+        )
+        deleted = out_rating.getvalue()
+        if not deleted:
+            return None
+        await apply_ratings(cur, product_id, deleted, sign=-1)
+    await invalidate(reviews_key(product_id), product_key(product_id))
+    logger.info(f"Review {review_id} was removed successfully")
+    return {"deleted_id": review_id}
+
+async def get_reviews_by_product(product_id: int):
+    return await get_or_load(reviews_key(product_id), lambda: _fetch_reviews_by_product(product_id))
+
+async def _fetch_reviews_by_product(product_id: int):
+    async with get_async_cursor() as cur:
+        await cur.execute("SELECT id, product_id, comments, rating, comment_by FROM product_review WHERE product_id=:1", [product_id])
+        # execute() resets the row factory, so it is set afterwards
+        cur.rowfactory = review_row
+        rows = await cur.fetchall()
         logger.info(f"All Reviews of product {product_id} was retrieved successfully")
-        return [dict(zip(["id", "product_id", "comment", "rating", "comment_by"], row)) for row in rows]
+        return rows
+
+# Reviews of many products in one query per 1000 products, grouped by product id.
+# Used to return products with their reviews without one query per product.
+async def get_reviews_by_products(product_ids: list):
+    grouped = {product_id: [] for product_id in product_ids}
+    if not product_ids:
+        return grouped
+    async with get_async_cursor() as cur:
+        for start in range(0, len(product_ids), IN_LIST_SIZE):
+            chunk = product_ids[start:start + IN_LIST_SIZE]
+            binds = ", ".join(f":{i + 1}" for i in range(len(chunk)))
+            await cur.execute(
+                f"SELECT id, product_id, comments, rating, comment_by FROM product_review "
+                f"WHERE product_id IN ({binds}) ORDER BY product_id, id",
+                chunk
+            )
+            cur.rowfactory = review_row
+            for review in await cur.fetchall():
+                grouped[review["product_id"]].append(review)
+    logger.info(f"Reviews of {len(product_ids)} products were retrieved successfully")
+    return grouped
@@ -0,0 +1,101 @@
+import sys
+import time
+import random
+import asyncio
+import logging
+import tempfile
+import statistics
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+# Throughput of the product lookup on the blocking path (def route + blocking_db.get_cursor)
+# against the asyncio path (async def route + get_async_cursor) for a growing number of
+# concurrent clients, against the local stand-in. A def route runs in Starlette's thread pool, which is capped at
+# 40 threads, so the sync mode is driven through a 40 thread executor to reproduce that limit.
+# The read cache is turned off so the async lookups reach the stand-in as the sync ones do.
+# Run from the project folder: python benchmarks/bench_async.py [clients ...]
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+sys.path.insert(0, str(PROJECT_DIR / "benchmarks"))
+
+import blocking_db
+import standin_db
+from app.services import cache, product_service
+
+CLIENTS = [int(arg) for arg in sys.argv[1:]] or [10, 40, 100, 400]
+REQUESTS_PER_CLIENT = 20
+THREADPOOL_SIZE = 40
+LATENCY = 0.005
+PRODUCTS = 1000
+
+
+# The product lookup on the blocking data-access path (blocking_db.get_cursor)
+def get_product(db, product_id):
+    with blocking_db.get_cursor(db) as cur:
+        cur.execute("SELECT id, name, description, price FROM product WHERE id = :1", [product_id])
+        row = cur.fetchone()
+        return dict(zip(["id", "name", "description", "price"], row)) if row else None
+
+
+async def sync_client(db, executor, latencies):
+    loop = asyncio.get_running_loop()
+    for _ in range(REQUESTS_PER_CLIENT):
+        start = time.perf_counter()
+        await loop.run_in_executor(executor, get_product, db, random.randint(1, PRODUCTS))
+        latencies.append(time.perf_counter() - start)
+
+
+async def async_client(latencies):
+    for _ in range(REQUESTS_PER_CLIENT):
+        start = time.perf_counter()
+        await product_service.get_product(random.randint(1, PRODUCTS))
+        latencies.append(time.perf_counter() - start)
+
+
+async def run_sync(db, clients, latencies):
+    blocking_db.create_pool(db)
+    with ThreadPoolExecutor(max_workers=THREADPOOL_SIZE) as executor:
+        await asyncio.gather(*[sync_client(db, executor, latencies) for _ in range(clients)])
+    blocking_db.close_pool()
+
+
+async def run_async(db, clients, latencies):
+    db.create_async_pool()
+    await asyncio.gather(*[async_client(latencies) for _ in range(clients)])
+    await db.close_async_pool()
+
+
+def report(mode, clients, runner, db, baseline=None):
+    latencies = []
+    start = time.perf_counter()
+    asyncio.run(runner(db, clients, latencies))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    p = lambda q: latencies[min(len(latencies) - 1, int(len(latencies) * q))] * 1000
+    rate = len(latencies) / elapsed
+    speedup = f"{rate / baseline:>7.2f}x" if baseline else ""
+    print(f"{clients:>8} {mode:>6} {rate:>10.0f} {statistics.mean(latencies) * 1000:>9.1f} "
+          f"{p(0.50):>8.1f} {p(0.99):>8.1f} {speedup}")
+    return rate
+
+
+def main():
+    logging.disable(logging.INFO)
+    cache.cache = None
+    with tempfile.TemporaryDirectory() as data_dir:
+        database = standin_db.StandInDatabase(Path(data_dir) / "api.db", latency=LATENCY)
+        standin_db.seed(database, products=PRODUCTS)
+        db = standin_db.install(database)
+        # enough connections for every client, so the pool is not what limits either mode
+        db.config.pool_max = max(CLIENTS)
+
+        print(f"{REQUESTS_PER_CLIENT} requests per client, round trip {LATENCY * 1000:.0f} ms, "
+              f"sync thread pool {THREADPOOL_SIZE}")
+        print(f"{'clients':>8} {'mode':>6} {'req/sec':>10} {'mean ms':>9} {'p50 ms':>8} {'p99 ms':>8} {'speedup':>8}")
+        for clients in CLIENTS:
+            sync_rate = report("sync", clients, run_sync, db)
+            report("async", clients, run_async, db, baseline=sync_rate)
+
+
+if __name__ == "__main__":
+    main()
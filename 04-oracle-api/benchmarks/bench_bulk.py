@@ -0,0 +1,85 @@
+import sys
+import time
+import asyncio
+import logging
+import tempfile
+from pathlib import Path
+
+# Rows/sec of a catalog import through the single-row endpoints (one request, INSERT and commit
+# per row) against the bulk endpoints (array DML, one transaction per request), on the stand-in.
+# Run from the project folder: python benchmarks/bench_bulk.py [rows] [rows_per_bulk_request]
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+sys.path.insert(0, str(PROJECT_DIR / "benchmarks"))
+
+import standin_db
+from app.models.product import Product
+from app.models.review import Review
+from app.routers import products, reviews
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+BULK_SIZE = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+LATENCY = 0.001
+
+
+def product_rows():
+    return [Product(name=f"Imported {i}", description=f"Imported product {i}", price=i % 100 + 0.99)
+            for i in range(ROWS)]
+
+
+def review_rows():
+    return [Review(comment=f"Imported review {i}", rating=i % 5 + 1, comment_by=f"User {i}") for i in range(ROWS)]
+
+
+async def single_products():
+    for product in product_rows():
+        await products.create_product(product)
+
+
+async def bulk_products():
+    rows = product_rows()
+    for start in range(0, len(rows), BULK_SIZE):
+        await products.create_products(rows[start:start + BULK_SIZE])
+
+
+async def single_reviews():
+    for review in review_rows():
+        await reviews.create_review(1, review)
+
+
+async def bulk_reviews():
+    rows = review_rows()
+    for start in range(0, len(rows), BULK_SIZE):
+        await reviews.create_reviews(1, rows[start:start + BULK_SIZE])
+
+
+async def run(db, job):
+    db.create_async_pool()
+    await job()
+    await db.close_async_pool()
+
+
+def main():
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as data_dir:
+        database = standin_db.StandInDatabase(Path(data_dir) / "api.db", latency=LATENCY)
+        standin_db.seed(database, products=1, reviews_per_product=0)
+        db = standin_db.install(database)
+
+        print(f"{ROWS} rows, {BULK_SIZE} rows per bulk request, round trip {LATENCY * 1000:.0f} ms")
+        print(f"{'endpoint':>28} {'seconds':>9} {'rows/sec':>10} {'round trips':>12} {'speedup':>8}")
+        for name, single, bulk in (("products", single_products, bulk_products),
+                                   ("reviews", single_reviews, bulk_reviews)):
+            baseline = None
+            for mode, job in (("single-row", single), ("bulk", bulk)):
+                round_trips = database.round_trips
+                start = time.perf_counter()
+                asyncio.run(run(db, job))
+                elapsed = time.perf_counter() - start
+                baseline = baseline or elapsed
+                print(f"{name + ' ' + mode:>28} {elapsed:>9.2f} {ROWS / elapsed:>10.0f} "
+                      f"{database.round_trips - round_trips:>12} {baseline / elapsed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import sys
+import time
+import asyncio
+import logging
+import tempfile
+import statistics
+from pathlib import Path
+import orjson
+
+# Latency of one page of products with their reviews: the N+1 pattern (the page, then
+# /products/{id}/reviews/ for each product) against GET /products/?include=reviews, which reads
+# all the page's reviews with one more query. The read cache is turned off so every request
+# reaches the stand-in database.
+# Run from the project folder: python benchmarks/bench_include.py [page_size] [pages]
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+sys.path.insert(0, str(PROJECT_DIR / "benchmarks"))
+
+import standin_db
+from app.services import cache
+from app.routers import products, reviews
+
+PAGE_SIZE = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+PAGES = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+PRODUCTS = 5000
+REVIEWS_PER_PRODUCT = 5
+LATENCY = 0.001
+
+
+# The routes return ORJSONResponse, so decode the body as a client would
+def body(response):
+    return orjson.loads(response.body)
+
+
+async def n_plus_one(after_id):
+    page = body(await products.get_all_products(limit=PAGE_SIZE, after_id=after_id, stream=False, include=None))
+    for product in page["items"]:
+        product["reviews"] = body(await reviews.get_reviews(product["id"]))
+    return page
+
+
+async def include_reviews(after_id):
+    return body(await products.get_all_products(limit=PAGE_SIZE, after_id=after_id, stream=False, include="reviews"))
+
+
+async def run(db, load_page, latencies):
+    db.create_async_pool()
+    after_id = 0
+    for _ in range(PAGES):
+        start = time.perf_counter()
+        page = await load_page(after_id)
+        latencies.append(time.perf_counter() - start)
+        assert len(page["items"]) == PAGE_SIZE and all(len(p["reviews"]) == REVIEWS_PER_PRODUCT for p in page["items"])
+        after_id = page["next_after_id"]
+    await db.close_async_pool()
+
+
+def main():
+    logging.disable(logging.INFO)
+    cache.cache = None
+    with tempfile.TemporaryDirectory() as data_dir:
+        database = standin_db.StandInDatabase(Path(data_dir) / "api.db", latency=LATENCY)
+        standin_db.seed(database, products=PRODUCTS, reviews_per_product=REVIEWS_PER_PRODUCT)
+        db = standin_db.install(database)
+
+        print(f"{PAGES} pages of {PAGE_SIZE} products with {REVIEWS_PER_PRODUCT} reviews each, "
+              f"round trip {LATENCY * 1000:.0f} ms")
+        print(f"{'mode':>16} {'mean ms':>9} {'p95 ms':>8} {'round trips/page':>17} {'speedup':>8}")
+        baseline = None
+        for mode, load_page in (("N+1", n_plus_one), ("include=reviews", include_reviews)):
+            latencies = []
+            round_trips = database.round_trips
+            asyncio.run(run(db, load_page, latencies))
+            mean = statistics.mean(latencies)
+            baseline = baseline or mean
+            p95 = sorted(latencies)[int(len(latencies) * 0.95) - 1]
+            print(f"{mode:>16} {mean * 1000:>9.1f} {p95 * 1000:>8.1f} "
+                  f"{(database.round_trips - round_trips) / PAGES:>17.0f} {baseline / mean:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import logging
+import tempfile
+import subprocess
+from pathlib import Path
+
+# Request latency of the product lookup with logging written inline ("sync"), through the
+# queue and background listener ("queued") and turned off ("off"), against the stand-in database
+# with no added latency so the cost of logging is visible. Each mode runs in its own process
+# with the log file in a temporary folder and the console sent to /dev/null. Writes to a local
+# page cache are almost free, so the runs are repeated with a delay added to every handler flush,
+# standing in for a slow disk, a terminal or a container log driver.
+# Run from the project folder: python benchmarks/bench_logging.py [clients] [requests_per_client]
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+sys.path.insert(0, str(PROJECT_DIR / "benchmarks"))
+
+MODES = ["sync", "queued", "off"]
+WRITE_DELAYS_MS = [0.0, 0.2]
+PRODUCTS = 1000
+
+
+async def client(products, requests, latencies):
+    for _ in range(requests):
+        start = time.perf_counter()
+        await products.get_product(random.randint(1, PRODUCTS))
+        latencies.append(time.perf_counter() - start)
+
+
+async def load(db, products, clients, requests, latencies):
+    db.create_async_pool()
+    await asyncio.gather(*[client(products, requests, latencies) for _ in range(clients)])
+    await db.close_async_pool()
+
+
+# Runs one mode in this process and prints its measurements as JSON on stdout
+def run_mode(clients, requests, data_dir, write_delay):
+    import standin_db
+    import app.logger
+    from app.services import cache
+    from app.routers import products
+
+    app.logger.LOGGING_CONFIG["handlers"]["file"]["filename"] = str(Path(data_dir) / "app.log")
+    if write_delay:
+        flush = logging.StreamHandler.flush
+        def slow_flush(handler):
+            flush(handler)
+            time.sleep(write_delay)
+        logging.StreamHandler.flush = slow_flush
+    app.logger.setup_logging()
+    # every lookup should reach the database and log its query
+    cache.cache = None
+    database = standin_db.StandInDatabase(Path(data_dir) / "api.db")
+    standin_db.seed(database, products=PRODUCTS)
+    db = standin_db.install(database)
+
+    latencies = []
+    start = time.perf_counter()
+    asyncio.run(load(db, products, clients, requests, latencies))
+    elapsed = time.perf_counter() - start
+    app.logger.stop_logging()
+    latencies.sort()
+    print(json.dumps({"rate": len(latencies) / elapsed, "mean": sum(latencies) / len(latencies),
+                      "p50": latencies[len(latencies) // 2], "p99": latencies[int(len(latencies) * 0.99)]}),
+          file=sys.__stdout__)
+
+
+def main():
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    print(f"{clients} clients x {requests} requests")
+    print(f"{'write ms':>9} {'logging':>8} {'req/sec':>10} {'mean ms':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for delay in WRITE_DELAYS_MS:
+        for mode in MODES:
+            with tempfile.TemporaryDirectory() as data_dir:
+                output = subprocess.run(
+                    [sys.executable, __file__, "--run", str(clients), str(requests), data_dir, str(delay / 1000)],
+                    env={**os.environ, "LOG_MODE": mode}, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                    text=True, check=True).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"{delay:>9.1f} {mode:>8} {result['rate']:>10.0f} {result['mean'] * 1000:>9.2f} "
+                  f"{result['p50'] * 1000:>8.2f} {result['p99'] * 1000:>8.2f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--run":
+        run_mode(int(sys.argv[2]), int(sys.argv[3]), sys.argv[4], float(sys.argv[5]))
+    else:
+        main()
@@ -0,0 +1,84 @@
+import sys
+import time
+import random
+import asyncio
+import timeit
+import statistics
+import logging
+import tempfile
+from pathlib import Path
+
+# Cost of the metrics: the product lookup requested through the whole application (ASGI
+# middleware, route, metered cursor) with metrics recorded and with the middleware removed and
+# every observe/inc replaced by a no-op, against the stand-in database with no added latency so
+# the overhead is not hidden behind the database. The cost of a single observe/inc call is
+# measured on its own as well, since a request makes about ten of them.
+# Run from the project folder: python benchmarks/bench_metrics.py [requests]
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+sys.path.insert(0, str(PROJECT_DIR / "benchmarks"))
+
+import httpx
+import standin_db
+from app.main import app
+from app.services import cache, metrics
+
+REQUESTS = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+PRODUCTS = 1000
+REPEAT = 10
+
+
+def call_cost(func):
+    return min(timeit.repeat(func, number=100_000, repeat=REPEAT)) / 100_000
+
+
+async def run(asgi_app, db):
+    db.create_async_pool()
+    transport = httpx.ASGITransport(app=asgi_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        for _ in range(REQUESTS):
+            response = await client.get(f"/products/{random.randint(1, PRODUCTS)}")
+            assert response.status_code == 200
+        elapsed = time.perf_counter() - start
+    await db.close_async_pool()
+    return elapsed / REQUESTS
+
+
+def main():
+    logging.disable(logging.INFO)
+    # every lookup should reach the database
+    cache.cache = None
+    with tempfile.TemporaryDirectory() as data_dir:
+        database = standin_db.StandInDatabase(Path(data_dir) / "api.db")
+        standin_db.seed(database, products=PRODUCTS)
+        db = standin_db.install(database)
+        observe_cost = call_cost(lambda: metrics.REQUEST_DURATION.observe(0.003, "GET", "/products/{product_id}", 200))
+        inc_cost = call_cost(lambda: metrics.ROWS_FETCHED.inc(1))
+
+        instrumented = app.build_middleware_stack()
+        # the same application without the middleware and with metrics that record nothing
+        app.user_middleware = [m for m in app.user_middleware if m.cls is not metrics.MetricsMiddleware]
+        plain = app.build_middleware_stack()
+        observe, inc = metrics.Histogram.observe, metrics.Counter.inc
+
+        # the modes alternate so warm-up and noise fall on both
+        on, off = [], []
+        for _ in range(REPEAT):
+            metrics.Histogram.observe, metrics.Counter.inc = observe, inc
+            on.append(asyncio.run(run(instrumented, db)))
+            metrics.Histogram.observe = lambda self, value, *labels: None
+            metrics.Counter.inc = lambda self, amount, *labels: None
+            off.append(asyncio.run(run(plain, db)))
+        on, off = statistics.median(on), statistics.median(off)
+
+    print(f"{REQUESTS} requests of GET /products/{{id}}, median of {REPEAT} alternating runs")
+    print(f"{'metrics':>8} {'µs/request':>11}")
+    print(f"{'off':>8} {off * 1_000_000:>11.1f}")
+    print(f"{'on':>8} {on * 1_000_000:>11.1f}")
+    print(f"observe {observe_cost * 1_000_000:.2f} µs, inc {inc_cost * 1_000_000:.2f} µs per call")
+    print(f"overhead {(on - off) * 1_000_000:.1f} µs/request ({(on - off) / off * 100:.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
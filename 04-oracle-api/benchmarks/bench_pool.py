@@ -0,0 +1,76 @@
+import sys
+import random
+import logging
+import tempfile
+import statistics
+import time
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+# Load test of the product lookup with and without the connection pool, against the local stand-in.
+# It drives the blocking path of blocking_db; the pool settings are the ones the app's async pool uses.
+# Each connect costs --connect-ms (the TCP/auth handshake) and each round trip --latency-ms.
+# Run from the project folder: python benchmarks/bench_pool.py [clients] [requests_per_client]
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+sys.path.insert(0, str(PROJECT_DIR / "benchmarks"))
+
+import blocking_db
+import standin_db
+
+CLIENTS = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+REQUESTS = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+CONNECT_LATENCY = 0.020
+LATENCY = 0.001
+PRODUCTS = 1000
+
+
+# The product lookup on the blocking data-access path (blocking_db.get_cursor)
+def get_product(db, product_id):
+    with blocking_db.get_cursor(db) as cur:
+        cur.execute("SELECT id, name, description, price FROM product WHERE id = :1", [product_id])
+        row = cur.fetchone()
+        return dict(zip(["id", "name", "description", "price"], row)) if row else None
+
+
+def client(db, count):
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        get_product(db, random.randint(1, PRODUCTS))
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def run(db, label):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=CLIENTS) as executor:
+        results = list(executor.map(lambda count: client(db, count), [REQUESTS] * CLIENTS))
+    elapsed = time.perf_counter() - start
+    latencies = sorted(l for result in results for l in result)
+    p = lambda q: latencies[min(len(latencies) - 1, int(len(latencies) * q))] * 1000
+    print(f"{label:>10} {len(latencies) / elapsed:>10.0f} {statistics.mean(latencies) * 1000:>9.1f} "
+          f"{p(0.50):>8.1f} {p(0.95):>8.1f} {p(0.99):>8.1f}")
+
+
+def main():
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as data_dir:
+        database = standin_db.StandInDatabase(Path(data_dir) / "api.db", latency=LATENCY,
+                                              connect_latency=CONNECT_LATENCY)
+        standin_db.seed(database, products=PRODUCTS)
+        db = standin_db.install(database)
+
+        print(f"{CLIENTS} clients x {REQUESTS} requests, connect {CONNECT_LATENCY * 1000:.0f} ms, "
+              f"round trip {LATENCY * 1000:.0f} ms")
+        print(f"{'mode':>10} {'req/sec':>10} {'mean ms':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+        run(db, "no pool")
+        db.config.pool_max = CLIENTS
+        blocking_db.create_pool(db)
+        run(db, "pool")
+        print(f"pool stats: {blocking_db.pool_stats()}")
+        blocking_db.close_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import sys
+import time
+import orjson
+from pathlib import Path
+from pydantic import TypeAdapter
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+# Per-row cost of turning fetched rows into a response body, without a database:
+#   before: dict(zip(columns, row)) in the service, then FastAPI's response_model=list
+#           validation, jsonable_encoder and the standard JSON encoder
+#   after:  the row factory used by the services, then orjson (ORJSONResponse, or one
+#           orjson call per fetched batch for the streamed product list)
+# Run from the project folder: python benchmarks/bench_serialization.py [rows]
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+
+from app.services.product_service import product_row, FETCH_BATCH_SIZE
+from app.services.review_service import review_row
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+REPEAT = 5
+PRODUCT_COLUMNS = ["id", "name", "description", "price"]
+REVIEW_COLUMNS = ["id", "product_id", "comment", "rating", "comment_by"]
+response_list = TypeAdapter(list)
+
+
+def product_rows():
+    return [(i, f"Product {i}", f"Description of product {i}", float(i % 1000) + 0.5) for i in range(ROWS)]
+
+
+def review_rows():
+    return [(i, i // 5, f"Review {i} of the product", i % 5 + 1, f"User {i}") for i in range(ROWS)]
+
+
+def before(rows, columns):
+    content = [dict(zip(columns, row)) for row in rows]
+    return JSONResponse(jsonable_encoder(response_list.validate_python(content))).body
+
+
+def products_after(rows):
+    chunks = [b"["]
+    for start in range(0, len(rows), FETCH_BATCH_SIZE):
+        batch = [product_row(*row) for row in rows[start:start + FETCH_BATCH_SIZE]]
+        chunks.append((b"," if start else b"") + orjson.dumps(batch)[1:-1])
+    chunks.append(b"]")
+    return b"".join(chunks)
+
+
+def reviews_after(rows):
+    return ORJSONResponse([review_row(*row) for row in rows]).body
+
+
+def measure(func, rows):
+    best = None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        body = func(rows)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(rows) * 1_000_000, body
+
+
+def main():
+    print(f"{ROWS} rows, best of {REPEAT}")
+    print(f"{'endpoint':>24} {'before µs/row':>14} {'after µs/row':>13} {'speedup':>8}")
+    cases = [
+        ("get_all_products", product_rows(), lambda rows: before(rows, PRODUCT_COLUMNS), products_after),
+        ("get_reviews_by_product", review_rows(), lambda rows: before(rows, REVIEW_COLUMNS), reviews_after),
+    ]
+    for name, rows, old, new in cases:
+        old_cost, old_body = measure(old, rows)
+        new_cost, new_body = measure(new, rows)
+        # both paths must produce the same document
+        assert orjson.loads(old_body) == orjson.loads(new_body)
+        print(f"{name:>24} {old_cost:>14.2f} {new_cost:>13.2f} {old_cost / new_cost:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
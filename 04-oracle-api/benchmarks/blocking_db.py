@@ -0,0 +1,48 @@
+from contextlib import contextmanager
+
+# The blocking data-access path the API served requests on before the routes moved to the
+# asyncio pool of app.services.db: a pool created with the same settings, and a cursor context
+# that borrows a connection from it (or opens a dedicated connection when there is no pool).
+# The benchmarks keep it to compare against. db is app.services.db after standin_db.install,
+# so db.oracledb is the stand-in driver.
+
+pool = None
+
+
+def create_pool(db):
+    global pool
+    pool = db.oracledb.create_pool(**db._pool_params())
+    return pool
+
+
+def close_pool():
+    global pool
+    if pool is not None:
+        pool.close()
+        pool = None
+
+
+def pool_stats():
+    if pool is None:
+        return {}
+    return {"open": pool.opened, "busy": pool.busy, "min": pool.min, "max": pool.max}
+
+
+@contextmanager
+def get_cursor(db):
+    if pool is None:
+        conn = db.oracledb.connect(user=db.config.oracle_user, password=db.config.oracle_password,
+                                   dsn=db.config.oracle_dsn)
+    else:
+        conn = pool.acquire()
+    cursor = conn.cursor()
+    try:
+        yield cursor
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        # returns pooled connections to the pool
+        conn.close()
@@ -0,0 +1,368 @@
+import re
+import time
+import queue
+import asyncio
+import sqlite3
+import oracledb
+import threading
+from types import SimpleNamespace
+
+# A local, SQLite-backed stand-in for python-oracledb used by the API benchmarks.
+# It provides connect(), create_pool() and their asyncio counterparts connect_async() and
+# create_pool_async() with the parts of the connection, cursor and pool API that app.services uses (positional binds, cursor.var + RETURNING ... INTO, fetchmany,
+# FETCH FIRST n ROWS ONLY), and can add a delay per connect and per round trip so that the
+# cost of connection setup and network latency shows up without an Oracle server.
+
+_FETCH_FIRST = re.compile(r"\s+FETCH\s+FIRST\s+(\S+)\s+ROWS\s+ONLY", re.IGNORECASE)
+_RETURNING_INTO = re.compile(r"\s+RETURNING\s+(.+?)\s+INTO\s+.+$", re.IGNORECASE | re.DOTALL)
+_BIND = re.compile(r"(?<![:\w]):(\w+)")
+
+SCHEMA = [
+    # the CHECKs stand in for Oracle rejecting values longer than the VARCHAR2 size
+    """CREATE TABLE IF NOT EXISTS product (
+        id INTEGER PRIMARY KEY, name VARCHAR2(100) NOT NULL CHECK (length(name) <= 100),
+        description VARCHAR2(200) CHECK (length(description) <= 200), price NUMBER NOT NULL)""",
+    """CREATE TABLE IF NOT EXISTS product_review (
+        id INTEGER PRIMARY KEY, comments VARCHAR2(250) CHECK (length(comments) <= 250),
+        rating NUMBER NOT NULL CHECK (rating BETWEEN 1 AND 5),
+        comment_by VARCHAR2(150) CHECK (length(comment_by) <= 150),
+        comment_on TIMESTAMP DEFAULT CURRENT_TIMESTAMP, product_id NUMBER REFERENCES product(id))""",
+    "CREATE INDEX IF NOT EXISTS product_review_product_id ON product_review (product_id)",
+    """CREATE TABLE IF NOT EXISTS product_rating (
+        product_id NUMBER PRIMARY KEY REFERENCES product(id), review_count NUMBER DEFAULT 0 NOT NULL,
+        rating_sum NUMBER DEFAULT 0 NOT NULL, stars_1 NUMBER DEFAULT 0 NOT NULL, stars_2 NUMBER DEFAULT 0 NOT NULL,
+        stars_3 NUMBER DEFAULT 0 NOT NULL, stars_4 NUMBER DEFAULT 0 NOT NULL, stars_5 NUMBER DEFAULT 0 NOT NULL)""",
+]
+
+# Builds the rating summaries from the reviews (the same statement as in the README)
+BACKFILL_RATINGS = """
+    INSERT INTO product_rating (product_id, review_count, rating_sum, stars_1, stars_2, stars_3, stars_4, stars_5)
+    SELECT p.id, COUNT(r.id), COALESCE(SUM(r.rating), 0),
+           COUNT(CASE WHEN r.rating = 1 THEN 1 END), COUNT(CASE WHEN r.rating = 2 THEN 1 END),
+           COUNT(CASE WHEN r.rating = 3 THEN 1 END), COUNT(CASE WHEN r.rating = 4 THEN 1 END),
+           COUNT(CASE WHEN r.rating = 5 THEN 1 END)
+    FROM product p LEFT JOIN product_review r ON r.product_id = p.id
+    WHERE p.id NOT IN (SELECT product_id FROM product_rating)
+    GROUP BY p.id"""
+
+
+# Rewrite the Oracle specific parts of a statement for SQLite
+def translate(sql):
+    sql = _FETCH_FIRST.sub(r" LIMIT \1", sql)
+    sql = _RETURNING_INTO.sub(r" RETURNING \1", sql)
+    return _BIND.sub("?", sql)
+
+
+class StandInVar:
+    def __init__(self, type=None):
+        self.type = type
+        # the values returned for each execution, as DML returning gives them
+        self.values = []
+
+    def getvalue(self, pos=0):
+        return self.values[pos] if pos < len(self.values) else []
+
+
+class StandInCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self._cursor = connection._conn.cursor()
+        self.arraysize = 100
+        self.prefetchrows = 2
+        self.rowfactory = None
+        self._inputsizes = []
+        self._batch_errors = []
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    def var(self, type, arraysize=None):
+        return StandInVar(type)
+
+    def setinputsizes(self, *args, **kwargs):
+        self._inputsizes = list(args)
+
+    def _row(self, row):
+        return self.rowfactory(*row) if self.rowfactory and row is not None else row
+
+    def execute(self, sql, params=None):
+        self.connection.round_trip()
+        params = list(params or [])
+        out_vars = [p for p in params if isinstance(p, StandInVar)]
+        binds = [p for p in params if not isinstance(p, StandInVar)]
+        # like python-oracledb, every execute starts without a row factory
+        self.rowfactory = None
+        try:
+            self._cursor.execute(translate(sql), binds)
+        except sqlite3.IntegrityError as e:
+            # raised as python-oracledb does, so the app's handling of ORA-00001 can be exercised
+            code = "ORA-00001" if "UNIQUE" in str(e) else "ORA-02291" if "FOREIGN KEY" in str(e) else "ORA-02290"
+            raise oracledb.IntegrityError(SimpleNamespace(full_code=code, message=f"{code}: {e}")) from e
+        if out_vars:
+            returned = self._cursor.fetchone()
+            for var, value in zip(out_vars, returned or [None] * len(out_vars)):
+                var.values = [[value] if returned else []]
+        return self
+
+    # Out variables for DML returning come from setinputsizes; with batcherrors a failing row
+    # is reported by getbatcherrors() and the other rows are still applied
+    def executemany(self, sql, rows, batcherrors=False, **kwargs):
+        self.connection.round_trip()
+        out_vars = [size for size in self._inputsizes if isinstance(size, StandInVar)]
+        if not out_vars and not batcherrors:
+            self._cursor.executemany(translate(sql), rows)
+            return
+        sql = translate(sql)
+        self._batch_errors = []
+        for var in out_vars:
+            var.values = []
+        for offset, row in enumerate(rows):
+            try:
+                self._cursor.execute(sql, list(row))
+                returned = self._cursor.fetchone() if out_vars else []
+            except sqlite3.Error as e:
+                if not batcherrors:
+                    raise
+                self._batch_errors.append(SimpleNamespace(offset=offset, message=f"ORA-stand-in: {e}"))
+                returned = [None] * len(out_vars)
+            for var, value in zip(out_vars, returned):
+                var.values.append([value] if value is not None else [])
+        # like python-oracledb, input sizes apply to one execution only
+        self._inputsizes = []
+
+    def getbatcherrors(self):
+        return self._batch_errors
+
+    def fetchone(self):
+        self.connection.round_trip()
+        return self._row(self._cursor.fetchone())
+
+    def fetchmany(self, size=None):
+        self.connection.round_trip()
+        return [self._row(row) for row in self._cursor.fetchmany(size or self.arraysize)]
+
+    def fetchall(self):
+        self.connection.round_trip()
+        return [self._row(row) for row in self._cursor.fetchall()]
+
+    def close(self):
+        self._cursor.close()
+
+
+class StandInConnection:
+    def __init__(self, database, pool=None, blocking=True):
+        self.database = database
+        self.pool = pool
+        # the async connection awaits the latency itself instead of sleeping in round_trip
+        self.blocking = blocking
+        self._conn = sqlite3.connect(database.path, timeout=60, check_same_thread=False)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+
+    def round_trip(self):
+        self.database.round_trip(wait=self.blocking)
+
+    def cursor(self):
+        return StandInCursor(self)
+
+    def commit(self):
+        self.round_trip()
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.release(self)
+        else:
+            self._conn.close()
+
+
+class StandInPool:
+    def __init__(self, database, min=1, max=4, **kwargs):
+        self.database = database
+        self.min = min
+        self.max = max
+        self.opened = 0
+        self.busy = 0
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        for _ in range(min):
+            self._idle.put(self._open())
+
+    def _open(self):
+        self.opened += 1
+        return self.database.connect(pool=self)
+
+    def acquire(self):
+        with self._lock:
+            if self._idle.empty() and self.opened < self.max:
+                self._idle.put(self._open())
+        conn = self._idle.get()
+        with self._lock:
+            self.busy += 1
+        return conn
+
+    def release(self, conn):
+        conn._conn.rollback()
+        with self._lock:
+            self.busy -= 1
+        self._idle.put(conn)
+
+    def close(self, force=False):
+        while not self._idle.empty():
+            self._idle.get()._conn.close()
+
+
+# The asyncio flavour: the round trip delay is awaited, so other coroutines run meanwhile,
+# and the (fast, local) SQLite work is then done on the event loop thread
+class StandInAsyncCursor(StandInCursor):
+    async def execute(self, sql, params=None):
+        await self.connection.database.async_wait()
+        return super().execute(sql, params)
+
+    async def executemany(self, sql, rows, **kwargs):
+        await self.connection.database.async_wait()
+        super().executemany(sql, rows, **kwargs)
+
+    async def fetchone(self):
+        await self.connection.database.async_wait()
+        return super().fetchone()
+
+    async def fetchmany(self, size=None):
+        await self.connection.database.async_wait()
+        return super().fetchmany(size)
+
+    async def fetchall(self):
+        await self.connection.database.async_wait()
+        return super().fetchall()
+
+
+class StandInAsyncConnection(StandInConnection):
+    def __init__(self, database, pool=None):
+        super().__init__(database, pool, blocking=False)
+
+    def cursor(self):
+        return StandInAsyncCursor(self)
+
+    async def commit(self):
+        await self.database.async_wait()
+        super().commit()
+
+    async def rollback(self):
+        super().rollback()
+
+    async def close(self):
+        if self.pool is not None:
+            await self.pool.release(self)
+        else:
+            self._conn.close()
+
+
+class StandInAsyncPool:
+    def __init__(self, database, min=1, max=4, **kwargs):
+        self.database = database
+        self.min = min
+        self.max = max
+        self.opened = 0
+        self.busy = 0
+        self._idle = []
+        self._waiters = []
+
+    async def acquire(self):
+        if not self._idle and self.opened < self.max:
+            self.opened += 1
+            self._idle.append(await self.database.connect_async(pool=self))
+        while not self._idle:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            await waiter
+        self.busy += 1
+        return self._idle.pop()
+
+    async def release(self, conn):
+        conn._conn.rollback()
+        self.busy -= 1
+        self._idle.append(conn)
+        if self._waiters:
+            self._waiters.pop(0).set_result(None)
+
+    async def close(self, force=False):
+        for conn in self._idle:
+            conn._conn.close()
+        self._idle = []
+
+
+class StandInDatabase:
+    def __init__(self, path, latency=0.0, connect_latency=0.0):
+        self.path = str(path)
+        self.latency = latency
+        self.connect_latency = connect_latency
+        self.round_trips = 0
+        self.connects = 0
+        self._lock = threading.Lock()
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        for statement in SCHEMA:
+            conn.execute(statement)
+        conn.commit()
+        conn.close()
+
+    def round_trip(self, wait=True):
+        with self._lock:
+            self.round_trips += 1
+        if self.latency and wait:
+            time.sleep(self.latency)
+
+    async def async_wait(self):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    def connect(self, pool=None):
+        with self._lock:
+            self.connects += 1
+        if self.connect_latency:
+            time.sleep(self.connect_latency)
+        return StandInConnection(self, pool)
+
+    async def connect_async(self, pool=None):
+        with self._lock:
+            self.connects += 1
+        if self.connect_latency:
+            await asyncio.sleep(self.connect_latency)
+        return StandInAsyncConnection(self, pool)
+
+    # An object with the module-level oracledb functions the services call
+    def driver(self):
+        return SimpleNamespace(
+            connect=lambda **kwargs: self.connect(),
+            create_pool=lambda min=1, max=4, **kwargs: StandInPool(self, min=min, max=max),
+            connect_async=lambda **kwargs: self.connect_async(),
+            create_pool_async=lambda min=1, max=4, **kwargs: StandInAsyncPool(self, min=min, max=max),
+            POOL_GETMODE_TIMEDWAIT=3,
+        )
+
+
+def seed(database, products=1000, reviews_per_product=5):
+    conn = sqlite3.connect(database.path)
+    conn.executemany("INSERT INTO product (id, name, description, price) VALUES (?, ?, ?, ?)",
+                     ((i, f"Product {i}", f"Description of product {i}", float(i % 1000) + 0.5)
+                      for i in range(1, products + 1)))
+    conn.executemany("INSERT INTO product_review (comments, rating, comment_by, product_id) VALUES (?, ?, ?, ?)",
+                     ((f"Review {r} of product {p}", r % 5 + 1, f"User {r}", p)
+                      for p in range(1, products + 1) for r in range(reviews_per_product)))
+    conn.execute(BACKFILL_RATINGS)
+    conn.commit()
+    conn.close()
+
+
+# Point app.services.db at the stand-in instead of python-oracledb
+def install(database):
+    import app.services.db as db
+    db.oracledb = database.driver()
+    return db
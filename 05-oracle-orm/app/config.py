@@ -10,6 +10,24 @@ class Settings(BaseSettings):
     ORACLE_PORT:int = 1521
     ORACLE_SERVICE:str = "FREE"
     SQL_ECHO:bool = False
+    # Connection pool of the engines: connections kept open, extra connections allowed under load,
+    # seconds to wait for a free connection, seconds before a connection is replaced and whether
+    # a connection is checked with a ping before it is handed out
+    DB_POOL_SIZE:int = 10
+    DB_MAX_OVERFLOW:int = 10
+    DB_POOL_TIMEOUT:int = 30
+    DB_POOL_RECYCLE:int = 1800
+    DB_POOL_PRE_PING:bool = True
+    # Bulk endpoints: rows written and committed together, and the most rows of a JSON array body
+    # (NDJSON and CSV uploads are streamed and not limited)
+    BULK_CHUNK_SIZE:int = 1000
+    BULK_MAX_ROWS:int = 10000
+    # Read cache of users by id: "memory" (per worker) or "redis" (shared by all workers)
+    CACHE_ENABLED:bool = True
+    CACHE_BACKEND:str = "memory"
+    CACHE_MAX_SIZE:int = 10000
+    CACHE_TTL:int = 60
+    CACHE_REDIS_URL:str = "redis://localhost:6379/0"
 
     class Config:
         env_file = ".env"
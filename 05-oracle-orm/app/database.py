@@ -1,6 +1,6 @@
 from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from urllib.parse import quote_plus
 from .config import settings
 
@@ -12,29 +12,53 @@ host = settings.ORACLE_HOST
 port = settings.ORACLE_PORT
 service = settings.ORACLE_SERVICE
 
-# Correct dialect for SQLAlchemy 1.4.23
 DATABASE_URL = (
     f"oracle+oracledb://{user}:{password}@{host}:{port}/?service_name={service}"
 )
+# The same database through python-oracledb's asyncio API (SQLAlchemy 2.0.25+)
+ASYNC_DATABASE_URL = (
+    f"oracle+oracledb_async://{user}:{password}@{host}:{port}/?service_name={service}"
+)
+
+POOL_OPTIONS = dict(
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+)
 
-# Create synchronous engine
+# Synchronous engine, kept for scripts and other blocking callers
 engine = create_engine(
     DATABASE_URL,
     echo=settings.SQL_ECHO,
+    **POOL_OPTIONS
 )
 
-# Create the session
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
     bind=engine
 )
 
+# Async engine used by the API. While a query waits on Oracle the event loop serves other
+# requests instead of holding one of Starlette's threadpool threads.
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    echo=settings.SQL_ECHO,
+    **POOL_OPTIONS
+)
+
+# expire_on_commit=False: attributes of committed objects stay loaded, an AsyncSession
+# cannot lazy-load them again when the response is built
+AsyncSessionLocal = async_sessionmaker(
+    autoflush=False,
+    expire_on_commit=False,
+    bind=async_engine
+)
+
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
\ No newline at end of file
@@ -1,17 +1,56 @@
+import os
+import queue
+import atexit
 import logging
+import itertools
+import multiprocessing
 import logging.config
+import logging.handlers
 from pathlib import Path
 
+# The same module is used by 02-schedule-job, 04-oracle-api and 05-oracle-orm, differing only
+# in SAMPLING_RATES. Each project is installed and deployed on its own from its folder, with no
+# package shared between them, so the file is copied; change all three copies together.
+
 # Create logs directory if not exists
 LOG_DIR = Path(__file__).resolve().parent / "logs"
 LOG_DIR.mkdir(exist_ok=True)
 
 LOG_FILE = LOG_DIR / "app.log"
 
+
+# Lets through one in every N records at or below max_level from the loggers listed in rates
+# (logger name -> N), so hot-path messages such as "query executed" do not flood the logs.
+# Warnings and errors are never dropped.
+class SamplingFilter(logging.Filter):
+    def __init__(self, rates=None, max_level="INFO"):
+        super().__init__()
+        self.rates = rates or {}
+        self.max_level = logging.getLevelName(max_level)
+        self._counters = {name: itertools.count() for name in self.rates}
+
+    def filter(self, record):
+        rate = self.rates.get(record.name)
+        if not rate or record.levelno > self.max_level:
+            return True
+        # the decision is kept on the record, as the same filter is attached to several handlers
+        if not hasattr(record, "sampled"):
+            record.sampled = next(self._counters[record.name]) % rate == 0
+        return record.sampled
+
+
+# the user lookups log every request
+SAMPLING_RATES = {"app.routers.user_router": 10}
+
 LOGGING_CONFIG = {
     "version": 1,
     "disable_existing_loggers": False,
 
+    # "queued": the request/job thread only puts records on a queue and a background thread
+    # writes them to the handlers. "sync": the handlers write inline. "off": only warnings and
+    # errors are logged. The LOG_MODE environment variable overrides it.
+    "mode": "queued",
+
     "formatters": {
         "standard": {
             "format": "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
@@ -21,18 +60,31 @@ LOGGING_CONFIG = {
         },
     },
 
+    "filters": {
+        "sampling": {
+            "()": SamplingFilter,
+            "rates": SAMPLING_RATES,
+        },
+    },
+
     "handlers": {
         "console": {
             "class": "logging.StreamHandler",
             "formatter": "standard",
             "level": "DEBUG",
+            "filters": ["sampling"],
         },
+        # rotated when it reaches maxBytes; for one file per day use
+        # "class": "logging.handlers.TimedRotatingFileHandler" with "when": "midnight"
         "file": {
-            "class": "logging.FileHandler",
+            "class": "logging.handlers.RotatingFileHandler",
             "formatter": "detailed",
             "filename": str(LOG_FILE),
-            "mode": "a",
+            "maxBytes": 10 * 1024 * 1024,
+            "backupCount": 5,
+            "encoding": "utf-8",
             "level": "INFO",
+            "filters": ["sampling"],
         },
     },
 
@@ -42,8 +94,77 @@ LOGGING_CONFIG = {
     },
 }
 
+_listener = None
+_handlers = []
+_mode = "sync"
+_worker_listener = None
+
+
+# Moves the root handlers behind a QueueHandler; their filters move to the QueueHandler so
+# sampled-out records are dropped before they are queued
+def _start_queue(root):
+    global _listener
+    handlers = root.handlers[:]
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    for handler in handlers:
+        root.removeHandler(handler)
+        for log_filter in handler.filters[:]:
+            handler.removeFilter(log_filter)
+            queue_handler.addFilter(log_filter)
+    root.addHandler(queue_handler)
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+# Writes out the records still queued; called at exit
+def stop_logging():
+    global _listener, _worker_listener
+    for listener in (_listener, _worker_listener):
+        if listener is not None:
+            listener.stop()
+    _listener = None
+    _worker_listener = None
+
+
+# initializer and initargs for a ProcessPoolExecutor. A worker process would otherwise inherit
+# a QueueHandler whose listener thread only runs in the parent, and lose its records; instead
+# the worker sends them over a multiprocessing queue to a listener in this process, which writes
+# them with the same handlers (so only one process ever rotates the log file).
+def process_pool_logging():
+    global _worker_listener
+    if not _handlers:
+        return None, ()
+    if _worker_listener is None:
+        log_queue = multiprocessing.Queue()
+        _worker_listener = logging.handlers.QueueListener(log_queue, *_handlers, respect_handler_level=True)
+        _worker_listener.start()
+    return _setup_worker_logging, (_worker_listener.queue, _mode, SAMPLING_RATES)
+
+
+# Runs in each worker process
+def _setup_worker_logging(log_queue, mode, rates):
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(rates))
+    root.addHandler(queue_handler)
+    root.setLevel(logging.DEBUG)
+    logging.disable(logging.INFO if mode == "off" else logging.NOTSET)
+
 
 def setup_logging():
-    logging.config.dictConfig(LOGGING_CONFIG)
+    global _handlers, _mode
+    stop_logging()
+    config = dict(LOGGING_CONFIG)
+    mode = os.getenv("LOG_MODE", config.pop("mode", "sync"))
+    logging.config.dictConfig(config)
+    logging.disable(logging.INFO if mode == "off" else logging.NOTSET)
+    _handlers = logging.getLogger().handlers[:]
+    _mode = mode
+    if mode == "queued":
+        _start_queue(logging.getLogger())
     logger = logging.getLogger(__name__)
-    logger.debug("Logging is configured.")
+    logger.debug(f"Logging is configured ({mode}).")
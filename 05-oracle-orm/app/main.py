@@ -1,9 +1,11 @@
 import logging
 from fastapi import FastAPI
+from sqlalchemy import select, func
 from app.models.user import User
 from app.logger import setup_logging
-from app.database import engine, Base, SessionLocal
+from app.database import async_engine, Base, AsyncSessionLocal
 from app.routers.user_router import router as user_router
+from app.routers.monitoring_router import router as monitoring_router
 
 setup_logging()
 logger = logging.getLogger("main")
@@ -11,15 +13,16 @@ logger = logging.getLogger("main")
 app = FastAPI(title="FastAPI and Oracle (SQLAlchemy) Example")
 
 app.include_router(user_router)
+app.include_router(monitoring_router)
 
 
 @app.on_event("startup")
-def on_startup():
-    Base.metadata.create_all(bind=engine)
+async def on_startup():
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
 
-    db = SessionLocal()
-    try:
-        count = db.query(User).count()
+    async with AsyncSessionLocal() as db:
+        count = await db.scalar(select(func.count()).select_from(User))
         if count == 0:
             logger.info("Initialize some values into USER table")
             initial = [
@@ -30,6 +33,9 @@ def on_startup():
                 User(id=5, name="Eva Green", age=30, gender="Female", phone="+91-9000000005", email="eva@example.com", city="Hyderabad", country="India"),
             ]
             db.add_all(initial)
-            db.commit()
-    finally:
-        db.close()
+            await db.commit()
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    await async_engine.dispose()
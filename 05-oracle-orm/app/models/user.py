@@ -1,8 +1,10 @@
-from sqlalchemy import Column, Integer, String, Identity
+from sqlalchemy import Column, Integer, String, Identity, Index
 from app.database import Base
 
 class User(Base):
     __tablename__ = "users"
+    # keyset pagination sorted by name seeks on (name, id)
+    __table_args__ = (Index("users_name_id", "name", "id"),)
 
     id = Column(Integer, Identity(start=6, increment=1), primary_key=True)
     name = Column(String(200), nullable=False)
@@ -0,0 +1,13 @@
+from fastapi import APIRouter
+from app.services import cache
+
+router = APIRouter(prefix="/monitoring", tags=["Monitoring"])
+
+@router.get(
+        "/cache",
+        response_model=dict,
+        summary="User cache statistics",
+        description="Backend, size, hits, misses, evictions, expired entries and hit rate of the user cache."
+)
+async def get_cache_stats():
+    return await cache.cache_stats()
@@ -1,10 +1,14 @@
+import csv
+import codecs
 import logging
-from typing import List
+from typing import List, Optional
+from pydantic import ValidationError
+from app.config import settings
 from app.database import get_db
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 import app.services.user_service as user_service
-from app.schemas.user import UserCreate, UserOut, UserUpdate
-from fastapi import APIRouter, Depends, HTTPException, status
+from app.schemas.user import UserCreate, UserOut, UserUpdate, UserBulkUpdate
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 
 logger = logging.getLogger(__name__)
 
@@ -14,11 +18,35 @@ router = APIRouter(prefix="/users", tags=["User"])
         "/", 
         response_description=List[UserOut], 
         summary="Get all users",
-        description="Fetch a list of all users with pagination support using `skip` and `limit`."
+        description="Fetch a list of all users with pagination support using `skip` and `limit`. "
+                    "With `sort` (`id` or `name`) the users come in pages of `limit` in that order as "
+                    "`{\"items\": [...], \"next_cursor\": ...}` (`limit` at most 1000); pass `next_cursor` back as `cursor` for the next page."
 )
-def fetch_all_users(skip:int=0, limit:int=100, db:Session = Depends(get_db)):
-    logger.info("All users are retrieved successfully")
-    return user_service.get_all_users(db, skip=skip, limit=limit)
+async def fetch_all_users(skip:int=0, limit:int=100, sort:Optional[str]=None,
+                          cursor:Optional[str]=None, db:AsyncSession = Depends(get_db)):
+    if sort is None and cursor is None:
+        logger.info("All users are retrieved successfully")
+        return await user_service.get_all_users(db, skip=skip, limit=limit)
+
+    after = None
+    if cursor is not None:
+        try:
+            cursor_sort, after = user_service.decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+        if sort is not None and sort != cursor_sort:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="The cursor belongs to another sort")
+        sort = cursor_sort
+    if sort not in user_service.SORT_COLUMNS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"sort must be one of {', '.join(user_service.SORT_COLUMNS)}")
+    # skip/limit above keeps accepting any limit, as it always has
+    if not 1 <= limit <= user_service.MAX_PAGE_SIZE:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"limit must be between 1 and {user_service.MAX_PAGE_SIZE} with sort or cursor")
+    users, next_cursor = await user_service.get_users_page(db, limit=limit, sort=sort, after=after)
+    logger.info(f"Page of {len(users)} users sorted by {sort} retrieved successfully")
+    return {"items": users, "next_cursor": next_cursor}
 
 @router.get(
         "/{user_id}", 
@@ -26,8 +54,8 @@ def fetch_all_users(skip:int=0, limit:int=100, db:Session = Depends(get_db)):
         summary="Get user by ID",
         description="Fetch a specific user by their unique `user_id`."
 )
-def get_user_by_id(user_id:int, db:Session = Depends(get_db)):
-    db_user = user_service.get_user_by_id(db, user_id)
+async def get_user_by_id(user_id:int, db:AsyncSession = Depends(get_db)):
+    db_user = await user_service.get_user(db, user_id)
     if not db_user:
         logger.warn("User id {user_id} not found")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
@@ -41,8 +69,120 @@ def get_user_by_id(user_id:int, db:Session = Depends(get_db)):
         summary="Create new user",
         description="Add a new user to the database. All fields are optional except `name`."
 )
-def create_user(user_in:UserCreate, db:Session = Depends(get_db)):
-    return user_service.create_user(db, user_in)
+async def create_user(user_in:UserCreate, db:AsyncSession = Depends(get_db)):
+    return await user_service.create_user(db, user_in)
+
+# Rows of a bulk request body, read as they arrive for NDJSON (one JSON object per line, left
+# as text for the schema to parse) and CSV (a header row with the field names, then one row per record)
+async def body_rows(request:Request):
+    content_type = request.headers.get("content-type", "application/json").split(";")[0].strip()
+    if content_type == "application/json":
+        try:
+            rows = await request.json()
+        except ValueError:
+            rows = None
+        if not isinstance(rows, list):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Expected a JSON array")
+        if len(rows) > settings.BULK_MAX_ROWS:
+            raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                                detail=f"At most {settings.BULK_MAX_ROWS} users per JSON request, use NDJSON or CSV")
+        for row in rows:
+            yield row
+    elif content_type == "application/x-ndjson":
+        async for line in body_lines(request):
+            if line.strip():
+                yield line.rstrip("\r\n")
+    elif content_type == "text/csv":
+        header = None
+        async for fields in csv_records(request):
+            if header is None:
+                header = fields
+            else:
+                # empty CSV fields are missing values
+                yield {field: value or None for field, value in zip(header, fields)}
+    else:
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                            detail="Send application/json, application/x-ndjson or text/csv")
+
+# Text lines of the body with their line endings, decoded as they arrive
+async def body_lines(request:Request):
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    rest = ""
+    async for chunk in request.stream():
+        *lines, rest = (rest + decoder.decode(chunk)).split("\n")
+        for line in lines:
+            yield line + "\n"
+    rest += decoder.decode(b"", final=True)
+    if rest:
+        yield rest
+
+# Parsed CSV records of the body. A quoted field may hold line breaks, so lines are gathered
+# until the quotes balance (an escaped "" counts twice) and the whole record goes to csv.reader.
+async def csv_records(request:Request):
+    record, quotes = "", 0
+    async for line in body_lines(request):
+        record += line
+        quotes += line.count('"')
+        if quotes % 2:
+            continue
+        if record.strip():
+            yield next(csv.reader([record]))
+        record, quotes = "", 0
+    if record.strip():
+        yield next(csv.reader([record]))
+
+# Validates the rows of a bulk request and writes them in chunks of BULK_CHUNK_SIZE, each
+# chunk committed on its own. Rows that fail validation are reported and skipped.
+async def write_in_chunks(request:Request, schema, write):
+    results, chunk, indexes = [], [], []
+
+    async def flush():
+        for index, outcome in zip(indexes, await write(chunk)):
+            results.append({"index": index, **outcome})
+        chunk.clear()
+        indexes.clear()
+
+    index = 0
+    async for row in body_rows(request):
+        try:
+            chunk.append(schema.model_validate_json(row) if isinstance(row, str) else schema.model_validate(row))
+            indexes.append(index)
+        except ValidationError as e:
+            results.append({"index": index, "error": "; ".join(map(error_message, e.errors()))})
+        index += 1
+        if len(chunk) >= settings.BULK_CHUNK_SIZE:
+            await flush()
+    if chunk:
+        await flush()
+    results.sort(key=lambda result: result["index"])
+    failed = sum(1 for result in results if "error" in result)
+    return {"succeeded": len(results) - failed, "failed": failed, "results": results}
+
+def error_message(error:dict):
+    location = ".".join(map(str, error["loc"]))
+    return f"{location}: {error['msg']}" if location else error["msg"]
+
+@router.post(
+        "/bulk",
+        response_model=dict,
+        summary="Create users in bulk",
+        description="Add many users at once from a JSON array, or a streamed NDJSON (`application/x-ndjson`) "
+                    "or CSV (`text/csv`) upload. Returns the new `id` or the `error` of every row by its `index`."
+)
+async def create_users(request:Request, db:AsyncSession = Depends(get_db)):
+    return await write_in_chunks(request, UserCreate, lambda users: user_service.create_users(db, users))
+
+@router.patch(
+        "/bulk",
+        response_model=dict,
+        summary="Update users in bulk",
+        description="Update many users at once from rows with the user `id` and the fields to change, "
+                    "in the same formats as `POST /users/bulk`. Returns the `id` or the `error` of every row by its `index`."
+)
+async def update_users(request:Request, db:AsyncSession = Depends(get_db)):
+    return await write_in_chunks(
+        request, UserBulkUpdate,
+        lambda changes: user_service.update_users(db, [change.dict(exclude_unset=True) for change in changes]))
 
 @router.put(
         "/{user_id}", 
@@ -50,8 +190,8 @@ def create_user(user_in:UserCreate, db:Session = Depends(get_db)):
         summary="Update existing user",
         description="Update details of an existing user by providing their `user_id` and updated fields."
 )
-def update_user(user_id:int, user_in:UserUpdate, db:Session = Depends(get_db)):
-    updated_user = user_service.update_user(db, user_id, user_in)
+async def update_user(user_id:int, user_in:UserUpdate, db:AsyncSession = Depends(get_db)):
+    updated_user = await user_service.update_user(db, user_id, user_in)
     if not updated_user:
         logger.warn("User id {user_id} not found for updating from the database")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
@@ -63,8 +203,8 @@ def update_user(user_id:int, user_in:UserUpdate, db:Session = Depends(get_db)):
         summary="Delete user",
         description="Delete a user permanently from the database using their `user_id`."
 )
-def delete_user(user_id:int, db:Session = Depends(get_db)):
-    ok = user_service.delete_user(db, user_id)
+async def delete_user(user_id:int, db:AsyncSession = Depends(get_db)):
+    ok = await user_service.delete_user(db, user_id)
     if not ok:
         logger.warn("User id {user_id} not found for removing from database")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
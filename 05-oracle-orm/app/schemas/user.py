@@ -22,3 +22,15 @@ class UserOut(UserBase):
     class Config:
         #orm_mode = True
         from_attributes = True
+
+
+# One row of PATCH /users/bulk: the user id and only the fields to change
+class UserBulkUpdate(BaseModel):
+    id: int
+    name: Optional[str] = None
+    age: Optional[int] = None
+    gender: Optional[str] = None
+    phone: Optional[str] = None
+    email: Optional[EmailStr] = None
+    city: Optional[str] = None
+    country: Optional[str] = None
@@ -0,0 +1,62 @@
+import logging
+from app.config import settings
+from app.services.cache_backend import MemoryCache, RedisCache
+
+logger = logging.getLogger(__name__)
+
+# Read-through cache for user lookups by id.
+# The backend (app/services/cache_backend.py) is picked by the cache settings: "memory" for an
+# LRU inside each worker process, "redis" for entries shared by all workers.
+
+
+def create_cache():
+    if not settings.CACHE_ENABLED:
+        return None
+    if settings.CACHE_BACKEND == "redis":
+        logger.info(f"Using the redis cache at {settings.CACHE_REDIS_URL}")
+        return RedisCache(settings.CACHE_REDIS_URL, settings.CACHE_TTL)
+    return MemoryCache(settings.CACHE_MAX_SIZE, settings.CACHE_TTL)
+
+
+cache = create_cache()
+
+
+def user_key(user_id):
+    return f"user:{user_id}"
+
+
+# Return the cached value for key, or call load() and cache what it returns (None is not cached)
+async def get_or_load(key, load):
+    if cache is None:
+        return await load()
+    found, value = await cache.get(key)
+    if found:
+        return value
+    version = await cache.version(key)
+    value = await load()
+    if value is not None:
+        await cache.set(key, value, version)
+    return value
+
+
+# Called after the change is committed, so a reader cannot cache the old row again
+async def invalidate(*keys):
+    if cache is not None and keys:
+        await cache.delete(*keys)
+
+
+# The version of key to pass to store(), taken before the value to cache is read
+async def current_version(key):
+    return await cache.version(key) if cache is not None else None
+
+
+# Caches the committed result of a write, unless an invalidation happened since version
+async def store(key, value, version):
+    if cache is not None:
+        await cache.set(key, value, version)
+
+
+async def cache_stats():
+    if cache is None:
+        return {"backend": None}
+    return await cache.info()
@@ -0,0 +1,126 @@
+import json
+import time
+import threading
+from collections import OrderedDict
+
+# Cache backends behind the read-through caches of app/services/cache.py. The "memory" backend
+# is a bounded LRU with a TTL inside each worker process. The "redis" backend keeps the entries
+# in Redis, so every uvicorn worker sees the same data and the same invalidations (needs the
+# redis package: pip install redis).
+# This file is the same in 04-oracle-api and 05-oracle-orm; what is cached and the settings stay
+# in each project's cache.py. The projects are deployed separately and share no package, so the
+# file is copied, and 05-oracle-orm/tests/test_cache_backend.py fails while the copies differ.
+
+
+class MemoryCache:
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # deletes so far, the keys deleted most recently with the count at their delete, and the
+        # highest count forgotten from them
+        self._version = 0
+        self._deleted = OrderedDict()
+        self._floor = 0
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0}
+
+    async def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.stats["hits"] += 1
+                    return True, value
+                del self._entries[key]
+                self.stats["expired"] += 1
+            self.stats["misses"] += 1
+            return False, None
+
+    async def set(self, key, value, version):
+        with self._lock:
+            # the key was invalidated while the value was loaded, it may already be stale
+            if version < self._floor or self._deleted.get(key, -1) > version:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    async def delete(self, *keys):
+        with self._lock:
+            self._version += 1
+            for key in keys:
+                self._entries.pop(key, None)
+                self._deleted[key] = self._version
+                self._deleted.move_to_end(key)
+            while len(self._deleted) > self.max_size:
+                self._floor = self._deleted.popitem(last=False)[1]
+
+    async def version(self, key):
+        return self._version
+
+    async def info(self):
+        return {"backend": "memory", "size": len(self._entries), "max_size": self.max_size,
+                "ttl": self.ttl, **self.stats, "hit_rate": hit_rate(self.stats)}
+
+
+class RedisCache:
+    # Writes the value only if the key's version is still the one read before the load, in one
+    # atomic step, so a delete from another worker cannot land between the check and the write
+    SET_IF_VERSION = """
+        if tonumber(redis.call('GET', KEYS[2]) or '0') ~= tonumber(ARGV[2]) then
+            return 0
+        end
+        redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[3])
+        return 1
+    """
+
+    def __init__(self, url, ttl):
+        import redis.asyncio as redis
+        self.ttl = ttl
+        self._redis = redis.from_url(url)
+        self._set_if_version = self._redis.register_script(self.SET_IF_VERSION)
+        self.stats = {"hits": 0, "misses": 0}
+
+    # The hash tag keeps a key and its version in the same Redis Cluster slot for the script
+    @staticmethod
+    def _version_key(key):
+        return f"version:{{{key}}}"
+
+    async def get(self, key):
+        value = await self._redis.get(key)
+        if value is None:
+            self.stats["misses"] += 1
+            return False, None
+        self.stats["hits"] += 1
+        return True, json.loads(value)
+
+    async def set(self, key, value, version):
+        await self._set_if_version(keys=[key, self._version_key(key)], args=[json.dumps(value), version, self.ttl])
+
+    async def delete(self, *keys):
+        # bumping the shared version of each key stops loads that started before the delete, in any
+        # worker, from writing their stale value back
+        async with self._redis.pipeline() as pipe:
+            for key in keys:
+                pipe.incr(self._version_key(key))
+                pipe.expire(self._version_key(key), self.ttl)
+            pipe.delete(*keys)
+            await pipe.execute()
+
+    async def version(self, key):
+        return int(await self._redis.get(self._version_key(key)) or 0)
+
+    async def info(self):
+        # evictions are done by Redis itself (maxmemory-policy) and reported by INFO stats; the
+        # hit and miss counters are this worker's
+        return {"backend": "redis", "ttl": self.ttl, **self.stats, "hit_rate": hit_rate(self.stats)}
+
+
+def hit_rate(stats):
+    lookups = stats["hits"] + stats["misses"]
+    return round(stats["hits"] / lookups, 4) if lookups else None
@@ -1,42 +1,170 @@
+import json
+import base64
 import logging
+from sqlalchemy import select, insert, update, delete, or_, and_
+from sqlalchemy.exc import DBAPIError
 from app.models.user import User
-from typing import Optional, List
-from sqlalchemy.orm import Session
-from app.schemas.user import UserCreate, UserUpdate
+from typing import Optional, List, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.schemas.user import UserCreate, UserUpdate, UserOut
+from app.services.cache import get_or_load, invalidate, store, current_version, user_key
 
 logger = logging.getLogger(__name__)
 
-def get_all_users(db:Session, skip:int = 0, limit:int = 100) -> List[User]:
-    return db.query(User).offset(skip).limit(limit).all()
+async def get_all_users(db:AsyncSession, skip:int = 0, limit:int = 100) -> List[User]:
+    result = await db.execute(select(User).offset(skip).limit(limit))
+    return result.scalars().all()
 
-def get_user_by_id(db:Session, user_id:int) -> Optional[User]:
-    return db.query(User).filter(User.id == user_id).first()
+# Keyset pagination: each page seeks past the sort key of the previous page's last row on an
+# index instead of having Oracle read and discard the skipped rows, so every page costs the
+# same. The id breaks ties, which keeps the order stable for non-unique sort columns.
+SORT_COLUMNS = {"id": User.id, "name": User.name}
+# Largest limit a keyset page accepts
+MAX_PAGE_SIZE = 1000
 
-def create_user(db:Session, user_in:UserCreate) -> User:
+# The next-page token is opaque to clients: the sort and the last row's key, base64 encoded
+def encode_cursor(sort:str, user:User) -> str:
+    key = [user.id] if sort == "id" else [getattr(user, sort), user.id]
+    return base64.urlsafe_b64encode(json.dumps({"sort": sort, "key": key}).encode()).decode()
+
+# Returns the sort and key of a next-page token, ValueError if it is not one
+def decode_cursor(cursor:str) -> Tuple[str, list]:
+    try:
+        token = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        sort, key = token["sort"], token["key"]
+    except (ValueError, TypeError, KeyError):
+        raise ValueError("Invalid cursor")
+    types = [int] if sort == "id" else [str, int]
+    if (sort not in SORT_COLUMNS or not isinstance(key, list) or len(key) != len(types)
+            or not all(isinstance(value, t) for value, t in zip(key, types))):
+        raise ValueError("Invalid cursor")
+    return sort, key
+
+async def get_users_page(db:AsyncSession, limit:int = 100, sort:str = "id",
+                         after:Optional[list] = None) -> Tuple[List[User], Optional[str]]:
+    column = SORT_COLUMNS[sort]
+    query = select(User)
+    if after is not None:
+        if sort == "id":
+            query = query.where(User.id > after[0])
+        else:
+            # (column, id) > (value, id), spelled out since Oracle only compares row values for
+            # equality; the leading column >= value lets the (name, id) index start the range there
+            query = query.where(and_(column >= after[0], or_(column > after[0], User.id > after[1])))
+    query = query.order_by(column, User.id) if sort != "id" else query.order_by(User.id)
+    # one row more than the page tells whether there is a next page
+    result = await db.execute(query.limit(limit + 1))
+    users = result.scalars().all()
+    next_cursor = encode_cursor(sort, users[limit - 1]) if len(users) > limit else None
+    return users[:limit], next_cursor
+
+async def get_user_by_id(db:AsyncSession, user_id:int) -> Optional[User]:
+    result = await db.execute(select(User).filter(User.id == user_id))
+    return result.scalars().first()
+
+# The user as cached and returned by GET /users/{user_id}, read through the cache
+async def get_user(db:AsyncSession, user_id:int) -> Optional[dict]:
+    async def load():
+        db_user = await get_user_by_id(db, user_id)
+        return UserOut.model_validate(db_user).model_dump() if db_user else None
+    return await get_or_load(user_key(user_id), load)
+
+async def create_user(db:AsyncSession, user_in:UserCreate) -> User:
     db_user = User(**user_in.dict())
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
+    # the new id is known only now; no reader can have cached it before
+    key = user_key(db_user.id)
+    await store(key, UserOut.model_validate(db_user).model_dump(), await current_version(key))
     logger.info(f'User {db_user.name} entry was created successfully')
     return db_user
 
-def update_user(db:Session, user_id:int, user_in:UserUpdate) -> Optional[User]:
-    db_user = get_user_by_id(db, user_id)
-    if not db_user:
+# Updates and deletes are one UPDATE/DELETE ... RETURNING statement (and the commit), instead of
+# reading the user first and reading it again after the change. The ORM session is not
+# synchronized (the objects of a request are not reused after the write).
+async def update_user(db:AsyncSession, user_id:int, user_in:UserUpdate) -> Optional[UserOut]:
+    result = await db.execute(
+        update(User).where(User.id == user_id).values(**user_in.dict(exclude_unset=True)).returning(*User.__table__.columns)
+        .execution_options(synchronize_session=False)
+    )
+    row = result.mappings().first()
+    await db.commit()
+    if row is None:
         return None
-    for field, value in user_in.dict(exclude_unset=True).items():
-        setattr(db_user, field, value)
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
-    logger.info(f'User {db_user.name} entry was updated successfully')
-    return db_user
+    await invalidate(user_key(user_id))
+    logger.info(f'User {row["name"]} entry was updated successfully')
+    return UserOut.model_validate(dict(row))
 
-def delete_user(db:Session, user_id:int) -> bool:
-    db_user = get_user_by_id(db, user_id)
-    if not db_user:
+async def delete_user(db:AsyncSession, user_id:int) -> bool:
+    result = await db.execute(
+        delete(User).where(User.id == user_id).returning(User.name).execution_options(synchronize_session=False)
+    )
+    name = result.scalar_one_or_none()
+    await db.commit()
+    if name is None:
         return False
-    db.delete(db_user)
-    db.commit()
-    logger.info(f'User {db_user.name} entry was removed successfully')
-    return True
\ No newline at end of file
+    await invalidate(user_key(user_id))
+    logger.info(f'User {name} entry was removed successfully')
+    return True
+
+# Oracle accepts at most 1000 values in an IN list
+IN_LIST_SIZE = 1000
+
+# Inserts one chunk of users with a single batched INSERT ... RETURNING id and commits it.
+# Returns {"id": ...} or {"error": ...} for each user, in order.
+async def create_users(db:AsyncSession, users_in:List[UserCreate]) -> List[dict]:
+    rows = [user_in.dict() for user_in in users_in]
+    try:
+        result = await db.execute(insert(User).returning(User.id, sort_by_parameter_order=True), rows)
+        ids = result.scalars().all()
+        await db.commit()
+    except DBAPIError as e:
+        await db.rollback()
+        logger.warning(f'Bulk insert of {len(rows)} users failed ({e.orig}), inserting them one at a time')
+        return await _write_one_at_a_time(db, rows, lambda row: insert(User).values(**row).returning(User.id))
+    logger.info(f'{len(ids)} users were created successfully')
+    return [{"id": user_id} for user_id in ids]
+
+# Applies one chunk of partial updates ({"id": ..., field: value, ...}) with batched UPDATEs by
+# primary key and commits them. Returns {"id": ...} or {"error": ...} for each change, in order.
+async def update_users(db:AsyncSession, changes:List[dict]) -> List[dict]:
+    ids = list({change["id"] for change in changes})
+    found = set()
+    for start in range(0, len(ids), IN_LIST_SIZE):
+        result = await db.execute(select(User.id).where(User.id.in_(ids[start:start + IN_LIST_SIZE])))
+        found.update(result.scalars())
+    outcomes = [{"id": change["id"]} if change["id"] in found else {"error": "User not found"} for change in changes]
+    # changes of existing users that set at least one field
+    indexes = [i for i, change in enumerate(changes) if change["id"] in found and len(change) > 1]
+    rows = [changes[i] for i in indexes]
+    try:
+        if rows:
+            await db.execute(update(User), rows)
+        await db.commit()
+    except DBAPIError as e:
+        await db.rollback()
+        logger.warning(f'Bulk update of {len(rows)} users failed ({e.orig}), updating them one at a time')
+        written = await _write_one_at_a_time(db, rows, lambda row: update(User).where(User.id == row["id"])
+                                             .values({k: v for k, v in row.items() if k != "id"}).returning(User.id))
+        for i, outcome in zip(indexes, written):
+            outcomes[i] = outcome
+    await invalidate(*{user_key(row["id"]) for row in rows})
+    logger.info(f'{len(rows)} users were updated successfully')
+    return outcomes
+
+# Fallback when a batch fails: each row in its own savepoint, so one bad row does not take the
+# rest of the chunk with it. An UPDATE that matches no row (the user was deleted meanwhile) is
+# reported as not found.
+async def _write_one_at_a_time(db:AsyncSession, rows:List[dict], statement) -> List[dict]:
+    outcomes = []
+    for row in rows:
+        try:
+            async with db.begin_nested():
+                result = await db.execute(statement(row))
+                user_id = result.scalar_one_or_none()
+            outcomes.append({"id": user_id} if user_id is not None else {"error": "User not found"})
+        except DBAPIError as e:
+            outcomes.append({"error": str(e.orig)})
+    await db.commit()
+    return outcomes
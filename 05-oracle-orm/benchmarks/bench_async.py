@@ -0,0 +1,100 @@
+import sys
+import time
+import random
+import asyncio
+import logging
+import tempfile
+import statistics
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+# Throughput of the user lookup on the sync engine (def route + Session) against the async
+# engine (async def route + AsyncSession) for a growing number of concurrent clients, against
+# the local SQLite stand-in. A def route runs in Starlette's thread pool, which is capped at
+# 40 threads, so the sync mode is driven through a 40 thread executor to reproduce that limit.
+# The ORM spends about a millisecond of CPU per request, more on the async path, which only
+# pays off once the time spent waiting on the database dominates, so the runs are repeated
+# for a near (5 ms) and a distant or busy (50 ms) database.
+# Run from the project folder: python benchmarks/bench_async.py [clients ...]
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+sys.path.insert(0, str(PROJECT_DIR / "benchmarks"))
+
+import standin_db
+from app.models.user import User
+from app.services import user_service
+
+CLIENTS = [int(arg) for arg in sys.argv[1:]] or [10, 40, 100, 400]
+REQUESTS_PER_CLIENT = 10
+THREADPOOL_SIZE = 40
+LATENCIES = [0.005, 0.05]
+USERS = 1000
+
+
+# The user lookup on the sync engine, as get_user_by_id was before the async engine
+def get_user(SessionLocal, user_id):
+    with SessionLocal() as db:
+        return db.query(User).filter(User.id == user_id).first()
+
+
+async def sync_client(SessionLocal, executor, latencies):
+    loop = asyncio.get_running_loop()
+    for _ in range(REQUESTS_PER_CLIENT):
+        start = time.perf_counter()
+        await loop.run_in_executor(executor, get_user, SessionLocal, random.randint(1, USERS))
+        latencies.append(time.perf_counter() - start)
+
+
+async def async_client(AsyncSessionLocal, latencies):
+    for _ in range(REQUESTS_PER_CLIENT):
+        start = time.perf_counter()
+        async with AsyncSessionLocal() as db:
+            await user_service.get_user_by_id(db, random.randint(1, USERS))
+        latencies.append(time.perf_counter() - start)
+
+
+async def run_sync(database, clients, latencies):
+    SessionLocal = database.sessionmaker(pool_size=max(CLIENTS), max_overflow=0)
+    with ThreadPoolExecutor(max_workers=THREADPOOL_SIZE) as executor:
+        await asyncio.gather(*[sync_client(SessionLocal, executor, latencies) for _ in range(clients)])
+    SessionLocal.kw["bind"].dispose()
+
+
+async def run_async(database, clients, latencies):
+    AsyncSessionLocal = database.async_sessionmaker(pool_size=max(CLIENTS), max_overflow=0)
+    await asyncio.gather(*[async_client(AsyncSessionLocal, latencies) for _ in range(clients)])
+    await AsyncSessionLocal.kw["bind"].dispose()
+
+
+def report(mode, clients, runner, database, baseline=None):
+    latencies = []
+    start = time.perf_counter()
+    asyncio.run(runner(database, clients, latencies))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    p = lambda q: latencies[min(len(latencies) - 1, int(len(latencies) * q))] * 1000
+    rate = len(latencies) / elapsed
+    speedup = f"{rate / baseline:>7.2f}x" if baseline else ""
+    print(f"{database.latency * 1000:>6.0f} {clients:>8} {mode:>6} {rate:>10.0f} {statistics.mean(latencies) * 1000:>9.1f} "
+          f"{p(0.50):>8.1f} {p(0.99):>8.1f} {speedup}")
+    return rate
+
+
+def main():
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as data_dir:
+        database = standin_db.StandInDatabase(Path(data_dir) / "users.db")
+        standin_db.seed(database, users=USERS)
+
+        # enough connections for every client, so the pool is not what limits either mode
+        print(f"{REQUESTS_PER_CLIENT} requests per client, sync thread pool {THREADPOOL_SIZE}, pool size {max(CLIENTS)}")
+        print(f"{'rt ms':>6} {'clients':>8} {'mode':>6} {'req/sec':>10} {'mean ms':>9} {'p50 ms':>8} {'p99 ms':>8} {'speedup':>8}")
+        for latency in LATENCIES:
+            database.latency = latency
+            for clients in CLIENTS:
+                sync_rate = report("sync", clients, run_sync, database)
+                report("async", clients, run_async, database, baseline=sync_rate)
+
+
+if __name__ == "__main__":
+    main()
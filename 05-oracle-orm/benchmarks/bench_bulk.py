@@ -0,0 +1,117 @@
+import sys
+import csv
+import io
+import json
+import time
+import asyncio
+import logging
+import tempfile
+from pathlib import Path
+
+# Rows per second through the API: one POST /users/ per user (add, commit and refresh each)
+# against POST /users/bulk with a JSON array, an NDJSON stream and a CSV upload (batched
+# INSERT ... RETURNING, committed every BULK_CHUNK_SIZE rows), and PATCH /users/bulk
+# against one PUT /users/{id} per user, against the local SQLite stand-in with a delay per
+# round trip.
+# Run from the project folder: python benchmarks/bench_bulk.py [rows]
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+sys.path.insert(0, str(PROJECT_DIR / "benchmarks"))
+
+import httpx
+import standin_db
+from app.main import app
+from app.database import get_db
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+SINGLE_ROWS = 500
+LATENCY = 0.001
+FIELDS = ["name", "age", "gender", "phone", "email", "city", "country"]
+
+
+def users(count, offset=0):
+    return [dict(name=f"Bulk User {offset + i}", age=20 + i % 50, gender="Female" if i % 2 else "Male",
+                 phone=f"+91-{8000000000 + offset + i}", email=f"bulk{offset + i}@example.com",
+                 city="Chennai", country="India") for i in range(count)]
+
+
+def as_ndjson(rows):
+    return "".join(json.dumps(row) + "\n" for row in rows).encode()
+
+
+def as_csv(rows):
+    out = io.StringIO()
+    writer = csv.DictWriter(out, FIELDS)
+    writer.writeheader()
+    writer.writerows(rows)
+    return out.getvalue().encode()
+
+
+async def single_create(client, rows):
+    for row in rows:
+        response = await client.post("/users/", json=row)
+        assert response.status_code == 201
+    return len(rows)
+
+
+async def single_update(client, rows):
+    for user_id, row in enumerate(rows, 1):
+        response = await client.put(f"/users/{user_id}", json={**row, "city": "Pune"})
+        assert response.status_code == 200
+    return len(rows)
+
+
+def bulk(method, content_type, encode):
+    async def send(client, rows):
+        response = await client.request(method, "/users/bulk", content=encode(rows),
+                                        headers={"content-type": content_type})
+        assert response.status_code == 200 and response.json()["failed"] == 0, response.text
+        return response.json()["succeeded"]
+    return send
+
+
+def changes(rows):
+    return [{"id": user_id, "city": "Pune"} for user_id in range(1, len(rows) + 1)]
+
+
+async def run(AsyncSessionLocal):
+    async def get_standin_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = get_standin_db
+    cases = [
+        ("POST /users/ x N", single_create, SINGLE_ROWS),
+        ("POST /bulk JSON", bulk("POST", "application/json", lambda rows: json.dumps(rows).encode()), ROWS),
+        ("POST /bulk NDJSON", bulk("POST", "application/x-ndjson", as_ndjson), ROWS),
+        ("POST /bulk CSV", bulk("POST", "text/csv", as_csv), ROWS),
+        ("PUT /users/{id} x N", single_update, SINGLE_ROWS),
+        ("PATCH /bulk JSON", bulk("PATCH", "application/json", lambda rows: json.dumps(changes(rows)).encode()), ROWS),
+    ]
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for offset, (name, send, count) in enumerate(cases):
+            rows = users(count, offset * ROWS)
+            start = time.perf_counter()
+            written = await send(client, rows)
+            results.append((name, written, time.perf_counter() - start))
+    await AsyncSessionLocal.kw["bind"].dispose()
+    return results
+
+
+def main():
+    logging.disable(logging.WARNING)
+    with tempfile.TemporaryDirectory() as data_dir:
+        database = standin_db.StandInDatabase(Path(data_dir) / "users.db", latency=LATENCY)
+        standin_db.seed(database, users=0)
+        results = asyncio.run(run(database.async_sessionmaker()))
+
+    print(f"round trip {LATENCY * 1000:.0f} ms")
+    print(f"{'endpoint':>20} {'rows':>7} {'seconds':>8} {'rows/sec':>9}")
+    for name, rows, elapsed in results:
+        print(f"{name:>20} {rows:>7} {elapsed:>8.2f} {rows / elapsed:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
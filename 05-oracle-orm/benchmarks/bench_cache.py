@@ -0,0 +1,82 @@
+import sys
+import time
+import random
+import asyncio
+import logging
+import tempfile
+import statistics
+from pathlib import Path
+
+# Latency of GET /users/{id} at the service level with the user cache off and on (memory
+# backend), for a read-only load and one where 5% of the requests update a user (which
+# invalidates its entry), against the local SQLite stand-in with a delay per round trip.
+# Lookups follow a skewed popularity (a few users are read far more than the rest).
+# Run from the project folder: python benchmarks/bench_cache.py [clients] [requests_per_client]
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+sys.path.insert(0, str(PROJECT_DIR / "benchmarks"))
+
+import standin_db
+from app.config import settings
+from app.schemas.user import UserUpdate
+from app.services import cache, user_service
+
+CLIENTS = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+REQUESTS = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+LATENCY = 0.001
+USERS = 10000
+WRITE_RATIOS = [0.0, 0.05]
+
+
+def pick_user():
+    return min(USERS, int(random.paretovariate(1.2)))
+
+
+def change(user_id):
+    return UserUpdate(name=f"User {user_id}", age=30, gender="Male", phone="+91-9999999999",
+                      email=f"user{user_id}@example.com", city="Pune", country="India")
+
+
+async def client(AsyncSessionLocal, write_ratio, latencies):
+    for _ in range(REQUESTS):
+        user_id = pick_user()
+        async with AsyncSessionLocal() as db:
+            if random.random() < write_ratio:
+                await user_service.update_user(db, user_id, change(user_id))
+                continue
+            start = time.perf_counter()
+            assert await user_service.get_user(db, user_id)
+            latencies.append(time.perf_counter() - start)
+
+
+async def run(database, write_ratio, latencies):
+    AsyncSessionLocal = database.async_sessionmaker()
+    await asyncio.gather(*[client(AsyncSessionLocal, write_ratio, latencies) for _ in range(CLIENTS)])
+    await AsyncSessionLocal.kw["bind"].dispose()
+
+
+def main():
+    logging.disable(logging.WARNING)
+    with tempfile.TemporaryDirectory() as data_dir:
+        database = standin_db.StandInDatabase(Path(data_dir) / "users.db", latency=LATENCY)
+        standin_db.seed(database, users=USERS)
+
+        print(f"{CLIENTS} clients x {REQUESTS} requests, round trip {LATENCY * 1000:.0f} ms")
+        print(f"{'writes':>7} {'cache':>6} {'mean ms':>8} {'p50 ms':>7} {'p99 ms':>7} {'hit rate':>9} {'round trips':>12}")
+        for write_ratio in WRITE_RATIOS:
+            for enabled in (False, True):
+                settings.CACHE_ENABLED = enabled
+                cache.cache = cache.create_cache()
+                latencies = []
+                round_trips = database.round_trips
+                asyncio.run(run(database, write_ratio, latencies))
+                latencies.sort()
+                stats = asyncio.run(cache.cache_stats())
+                hit_rate = f"{stats['hit_rate']:.1%}" if enabled else "-"
+                print(f"{write_ratio:>7.0%} {'on' if enabled else 'off':>6} {statistics.mean(latencies) * 1000:>8.2f} "
+                      f"{latencies[len(latencies) // 2] * 1000:>7.2f} {latencies[int(len(latencies) * 0.99)] * 1000:>7.2f} "
+                      f"{hit_rate:>9} {database.round_trips - round_trips:>12}")
+
+
+if __name__ == "__main__":
+    main()
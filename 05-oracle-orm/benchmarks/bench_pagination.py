@@ -0,0 +1,88 @@
+import sys
+import time
+import asyncio
+import logging
+import tempfile
+import statistics
+from pathlib import Path
+from sqlalchemy import select
+
+# Latency of one page of users deep into the table: skip/limit (get_all_users) against keyset
+# pagination on id and on (name, id) (get_users_page with the cursor of the previous page),
+# from page 1 to page 10,000, against the local SQLite stand-in. The stand-in adds no
+# latency, so what grows is the work the database does to reach the page.
+# Run from the project folder: python benchmarks/bench_pagination.py [page_size]
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+sys.path.insert(0, str(PROJECT_DIR / "benchmarks"))
+
+import standin_db
+from app.models.user import User
+from app.services import user_service
+
+PAGE_SIZE = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+PAGES = [1, 10, 100, 1000, 10000]
+USERS = PAGE_SIZE * max(PAGES)
+REPEAT = 20
+
+
+async def offset_page(db, page, key):
+    return await user_service.get_all_users(db, skip=(page - 1) * PAGE_SIZE, limit=PAGE_SIZE)
+
+
+def keyset_page(sort):
+    async def load(db, page, key):
+        users, next_cursor = await user_service.get_users_page(db, limit=PAGE_SIZE, sort=sort, after=key)
+        return users
+    return load
+
+
+# The cursor the client holds when it asks for the page: the key of the previous page's last row
+async def page_keys(db, sort):
+    keys = {}
+    for page in PAGES:
+        if page == 1:
+            keys[page] = None
+            continue
+        column = user_service.SORT_COLUMNS[sort]
+        query = select(User).order_by(column, User.id).offset((page - 1) * PAGE_SIZE - 1).limit(1)
+        user = (await db.execute(query)).scalars().first()
+        keys[page] = user_service.decode_cursor(user_service.encode_cursor(sort, user))[1]
+    return keys
+
+
+async def run(AsyncSessionLocal):
+    results = {}
+    async with AsyncSessionLocal() as db:
+        keys = {"id": await page_keys(db, "id"), "name": await page_keys(db, "name")}
+    modes = [("skip/limit", offset_page, None), ("keyset id", keyset_page("id"), "id"),
+             ("keyset name", keyset_page("name"), "name")]
+    for mode, load, sort in modes:
+        for page in PAGES:
+            latencies = []
+            for _ in range(REPEAT):
+                async with AsyncSessionLocal() as db:
+                    start = time.perf_counter()
+                    users = await load(db, page, keys[sort][page] if sort else None)
+                    latencies.append(time.perf_counter() - start)
+                assert len(users) == PAGE_SIZE
+            results[mode, page] = statistics.median(latencies)
+    await AsyncSessionLocal.kw["bind"].dispose()
+    return modes, results
+
+
+def main():
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as data_dir:
+        database = standin_db.StandInDatabase(Path(data_dir) / "users.db")
+        standin_db.seed(database, users=USERS)
+        modes, results = asyncio.run(run(database.async_sessionmaker()))
+
+    print(f"{USERS} users, {PAGE_SIZE} per page, median ms of {REPEAT} requests")
+    print(f"{'page':>12}" + "".join(f"{page:>10}" for page in PAGES))
+    for mode, _, _ in modes:
+        print(f"{mode:>12}" + "".join(f"{results[mode, page] * 1000:>10.2f}" for page in PAGES))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import sys
+import time
+import asyncio
+import logging
+import tempfile
+import statistics
+from pathlib import Path
+
+# Round trips and latency of PUT /users/{id} and DELETE /users/{id} at the service level: the
+# read-modify-write versions (get the user, change it, commit, refresh) against the single
+# UPDATE/DELETE ... RETURNING statements of user_service, against the local SQLite stand-in,
+# which counts every statement, commit, rollback and connection pre-ping as a round trip.
+# The round trips of the RETURNING path are checked by tests/test_user_writes.py.
+# Run from the project folder: python benchmarks/bench_writes.py [requests]
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+sys.path.insert(0, str(PROJECT_DIR / "benchmarks"))
+
+import standin_db
+from app.schemas.user import UserUpdate
+from app.services import user_service
+
+REQUESTS = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+LATENCY = 0.001
+USERS = 1000
+
+
+# update_user and delete_user as they were before RETURNING
+async def update_user_before(db, user_id, user_in):
+    db_user = await user_service.get_user_by_id(db, user_id)
+    if not db_user:
+        return None
+    for field, value in user_in.dict(exclude_unset=True).items():
+        setattr(db_user, field, value)
+    db.add(db_user)
+    await db.commit()
+    await db.refresh(db_user)
+    return db_user
+
+
+async def delete_user_before(db, user_id):
+    db_user = await user_service.get_user_by_id(db, user_id)
+    if not db_user:
+        return False
+    await db.delete(db_user)
+    await db.commit()
+    return True
+
+
+def change(user_id):
+    return UserUpdate(name=f"User {user_id}", age=40, gender="Female", phone="+91-9999999999",
+                      email=f"changed{user_id}@example.com", city="Pune", country="India")
+
+
+async def measure(database, AsyncSessionLocal, call, user_ids):
+    round_trips, latencies = [], []
+    for user_id in user_ids:
+        before = database.round_trips
+        start = time.perf_counter()
+        async with AsyncSessionLocal() as db:
+            assert await call(db, user_id)
+        latencies.append(time.perf_counter() - start)
+        round_trips.append(database.round_trips - before)
+    return statistics.mean(round_trips), statistics.mean(latencies)
+
+
+async def run(database, AsyncSessionLocal):
+    cases = [
+        ("update", "before", lambda db, user_id: update_user_before(db, user_id, change(user_id)), range(1, REQUESTS + 1)),
+        ("update", "RETURNING", lambda db, user_id: user_service.update_user(db, user_id, change(user_id)),
+         range(1, REQUESTS + 1)),
+        ("delete", "before", delete_user_before, range(1, REQUESTS + 1)),
+        ("delete", "RETURNING", user_service.delete_user, range(REQUESTS + 1, 2 * REQUESTS + 1)),
+    ]
+    results = []
+    for operation, mode, call, user_ids in cases:
+        results.append((operation, mode, *await measure(database, AsyncSessionLocal, call, user_ids)))
+    await AsyncSessionLocal.kw["bind"].dispose()
+    return results
+
+
+def main():
+    logging.disable(logging.WARNING)
+    with tempfile.TemporaryDirectory() as data_dir:
+        database = standin_db.StandInDatabase(Path(data_dir) / "users.db", latency=LATENCY)
+        standin_db.seed(database, users=USERS)
+        results = asyncio.run(run(database, database.async_sessionmaker()))
+
+    print(f"{REQUESTS} requests, round trip {LATENCY * 1000:.0f} ms")
+    print(f"{'operation':>10} {'mode':>10} {'round trips':>12} {'mean ms':>8}")
+    for operation, mode, round_trips, latency in results:
+        print(f"{operation:>10} {mode:>10} {round_trips:>12.1f} {latency * 1000:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import os
+import time
+import sqlite3
+import asyncio
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.util import await_only
+from sqlalchemy.sql.compiler import InsertmanyvaluesSentinelOpts
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+# A local, SQLite-backed stand-in for the Oracle database used by the ORM benchmarks.
+# It builds a sync engine and an async engine (aiosqlite) over one database file with the pool
+# options of app.database, and can add a delay to every round trip (statement, commit,
+# rollback and the pre-ping of a checked out connection) so that network latency shows up
+# without an Oracle server. The sync engine sleeps in the calling thread, as a blocking
+# driver waits on its socket; the async engine awaits on the event loop, as oracledb's asyncio
+# API does.
+
+# app.config.Settings requires the Oracle credentials even though the benchmarks never connect
+os.environ.setdefault("ORACLE_USER", "standin")
+os.environ.setdefault("ORACLE_PASSWORD", "standin")
+
+from app.database import Base, POOL_OPTIONS
+from app.models.user import User
+
+
+class StandInDatabase:
+    def __init__(self, path, latency=0.0):
+        self.path = str(path)
+        self.latency = latency
+        # round trips a real server would have seen
+        self.round_trips = 0
+
+    def create_engine(self, **options):
+        engine = create_engine(f"sqlite:///{self.path}", connect_args={"check_same_thread": False},
+                               **{**POOL_OPTIONS, **options})
+        self._configure(engine, lambda: time.sleep(self.latency))
+        return engine
+
+    def create_async_engine(self, **options):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{self.path}", **{**POOL_OPTIONS, **options})
+        # the events run inside the greenlet of the awaiting session, so they can await
+        self._configure(engine.sync_engine, lambda: await_only(asyncio.sleep(self.latency)))
+        return engine
+
+    def _configure(self, engine, wait):
+        # A batched INSERT ... RETURNING that keeps the rows' order is one executemany round trip
+        # on Oracle. SQLite's dialect falls back to one INSERT per row for it unless told that
+        # the autoincrement ids can put the returned rows back in order, which holds for SQLite.
+        engine.dialect.insertmanyvalues_implicit_sentinel = InsertmanyvaluesSentinelOpts.ANY_AUTOINCREMENT
+
+        def round_trip(*args, **kwargs):
+            self.round_trips += 1
+            if self.latency:
+                wait()
+
+        event.listen(engine, "before_cursor_execute", round_trip)
+        event.listen(engine, "commit", round_trip)
+        event.listen(engine, "rollback", round_trip)
+        if engine.pool._pre_ping:
+            event.listen(engine.pool, "checkout", round_trip)
+
+    def sessionmaker(self, **options):
+        return sessionmaker(autoflush=False, bind=self.create_engine(**options))
+
+    def async_sessionmaker(self, **options):
+        return async_sessionmaker(autoflush=False, expire_on_commit=False, bind=self.create_async_engine(**options))
+
+
+# Creates the users table and fills it with generated users
+def seed(database, users=1000):
+    engine = create_engine(f"sqlite:///{database.path}")
+    Base.metadata.create_all(engine)
+    rows = [dict(id=i, name=f"User {i}", age=20 + i % 50, gender="Female" if i % 2 else "Male",
+                 phone=f"+91-{9000000000 + i}", email=f"user{i}@example.com", city="Bengaluru", country="India")
+            for i in range(1, users + 1)]
+    if rows:
+        with engine.begin() as conn:
+            conn.execute(insert(User), rows)
+    engine.dispose()
+    # readers do not block the writer and each other
+    with sqlite3.connect(database.path) as conn:
+        conn.execute("PRAGMA journal_mode=WAL")
@@ -0,0 +1,15 @@
+from pathlib import Path
+
+import pytest
+
+# app/services/cache_backend.py is copied between 04-oracle-api and 05-oracle-orm, which are
+# deployed separately; a fix to one copy has to reach the other.
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+BACKEND = Path("app", "services", "cache_backend.py")
+OTHER_COPY = PROJECT_DIR.parent / "04-oracle-api" / BACKEND
+
+
+@pytest.mark.skipif(not OTHER_COPY.exists(), reason="04-oracle-api is not checked out next to this project")
+def test_cache_backend_matches_04_oracle_api():
+    assert (PROJECT_DIR / BACKEND).read_text() == OTHER_COPY.read_text(), \
+        f"{BACKEND} differs from {OTHER_COPY}; apply the change to both copies"
@@ -0,0 +1,74 @@
+import sys
+import asyncio
+import logging
+from pathlib import Path
+
+import pytest
+
+# Round trips of PUT /users/{id} and DELETE /users/{id} at the service level, against the local
+# SQLite stand-in of the benchmarks, which counts every statement, commit, rollback and
+# connection pre-ping as a round trip.
+# Run from the project folder: python -m pytest tests
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+sys.path.insert(0, str(PROJECT_DIR / "benchmarks"))
+
+import standin_db
+from app.schemas.user import UserUpdate
+from app.services import user_service
+
+USERS = 10
+# the pre-ping, the statement and the commit
+EXPECTED_ROUND_TRIPS = 3
+
+
+def change(user_id):
+    return UserUpdate(name=f"User {user_id}", age=40, gender="Female", phone="+91-9999999999",
+                      email=f"changed{user_id}@example.com", city="Pune", country="India")
+
+
+@pytest.fixture
+def database(tmp_path):
+    logging.disable(logging.WARNING)
+    database = standin_db.StandInDatabase(tmp_path / "users.db")
+    standin_db.seed(database, users=USERS)
+    yield database
+    logging.disable(logging.NOTSET)
+
+
+# Runs call(db) in its own session and returns its result and the round trips it made
+def run(database, call):
+    async def session():
+        AsyncSessionLocal = database.async_sessionmaker()
+        try:
+            before = database.round_trips
+            async with AsyncSessionLocal() as db:
+                result = await call(db)
+            return result, database.round_trips - before
+        finally:
+            await AsyncSessionLocal.kw["bind"].dispose()
+    return asyncio.run(session())
+
+
+def test_update_user_is_one_statement(database):
+    user, round_trips = run(database, lambda db: user_service.update_user(db, 1, change(1)))
+    assert user.city == "Pune" and user.email == "changed1@example.com"
+    assert round_trips == EXPECTED_ROUND_TRIPS
+
+
+def test_delete_user_is_one_statement(database):
+    deleted, round_trips = run(database, lambda db: user_service.delete_user(db, 2))
+    assert deleted is True
+    assert round_trips == EXPECTED_ROUND_TRIPS
+    user, _ = run(database, lambda db: user_service.get_user_by_id(db, 2))
+    assert user is None
+
+
+def test_missing_user_is_one_statement_each(database):
+    async def update_and_delete(db):
+        return (await user_service.update_user(db, USERS + 1, change(USERS + 1)),
+                await user_service.delete_user(db, USERS + 1))
+
+    (user, deleted), round_trips = run(database, update_and_delete)
+    assert user is None and deleted is False
+    assert round_trips == 2 * EXPECTED_ROUND_TRIPS